@@ -2,19 +2,184 @@ import os
 import sys
 import pandas as pd
 import numpy as np
-import joblib
-from flask import Flask, request, render_template
+import json
+import tempfile
+import threading
+from flask import Flask, Response, jsonify, request, render_template, stream_with_context
 
 # ✅ Add root path to allow relative imports (like in main.py)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))  # auto_eda_project.* imports
+
+from serving.micro_batcher import MicroBatcher
+from serving.model_manager import ModelManager
+from serving.prediction_cache import PredictionCache, make_feature_key
+from serving.online_drift import OnlineDriftMonitor
+from preprocessing.category_normalizer import CategoryNormalizer
 
 app = Flask(__name__)
 
-# ✅ Path to trained model
+# ✅ Path to trained model (fallback when the MLflow registry is unreachable)
 MODEL_PATH = os.path.join("..", "save_model", "best_capstone_model.pkl")
-if not os.path.exists(MODEL_PATH):
-    raise FileNotFoundError(f"🚫 Model not found at: {MODEL_PATH}")
-model = joblib.load(MODEL_PATH)
+
+# ✅ Category mappings learned at training time (job_title typos, spelling variants)
+CATEGORY_MAPPINGS_PATH = os.path.join("..", "save_model", "category_mappings.json")
+category_normalizer = CategoryNormalizer.load(CATEGORY_MAPPINGS_PATH) if os.path.exists(CATEGORY_MAPPINGS_PATH) else None
+
+# ✅ Registry-backed model cache (hot reload + rollback)
+MODEL_REGISTRY_PREFIX = "BestSalaryModel"
+MODEL_CACHE_DIR = os.path.join("..", "save_model", "registry_cache")
+MODEL_POLL_INTERVAL_S = 60.0
+MODEL_KEEP_VERSIONS = 3
+
+# ✅ Under gunicorn with preload_app (see gunicorn.conf.py) the master loads the model
+# once and the workers share its memory; each worker starts its own poller after fork
+PRELOADED = os.environ.get("CAPSTONE_PRELOAD") == "1"
+
+model_manager = ModelManager(
+    model_name_prefix=MODEL_REGISTRY_PREFIX,
+    cache_dir=MODEL_CACHE_DIR,
+    fallback_path=MODEL_PATH,
+    poll_interval_s=MODEL_POLL_INTERVAL_S,
+    keep_versions=MODEL_KEEP_VERSIONS,
+).start(poll=not PRELOADED)
+
+# ✅ Batch scoring config (rows per model.predict call for uploaded files)
+BATCH_CHUNK_SIZE = 10_000
+
+# ✅ Micro-batching config for the JSON API
+API_MAX_BATCH_SIZE = 64
+API_MAX_WAIT_MS = 5.0
+API_TIMEOUT_S = 10.0
+API_CLIENT_ERRORS = (ValueError, TypeError, KeyError)  # Raised for a bad record: 400, not 500
+
+# ✅ Prediction cache config (keyed on aligned features, reset on model swaps)
+PREDICTION_CACHE_SIZE = 10_000
+PREDICTION_CACHE_TTL_S = 3600.0
+
+prediction_cache = PredictionCache(max_size=PREDICTION_CACHE_SIZE, ttl_s=PREDICTION_CACHE_TTL_S)
+
+# ✅ Online drift monitoring (sliding-window histograms vs the reference profile of the
+# served model version; the windows restart when a different version is swapped in)
+DRIFT_WINDOW_S = 3600.0
+DRIFT_WINDOW_BUCKETS = 12
+DRIFT_FLUSH_INTERVAL_S = 300.0
+
+drift_monitor = None
+drift_monitor_version = None
+drift_monitor_lock = threading.Lock()
+
+
+def current_drift_monitor():
+    """
+    Returns the drift monitor of the served model version, rebuilding it after a model
+    swap or rollback (None when that version has no reference profile).
+    """
+    global drift_monitor, drift_monitor_version
+    loaded = model_manager.current()
+    with drift_monitor_lock:
+        if drift_monitor_version != loaded.version:
+            if drift_monitor is not None:
+                drift_monitor.stop()
+            drift_monitor = OnlineDriftMonitor(
+                loaded.reference_profile,
+                window_s=DRIFT_WINDOW_S,
+                n_buckets=DRIFT_WINDOW_BUCKETS,
+                flush_interval_s=DRIFT_FLUSH_INTERVAL_S,
+            ) if loaded.reference_profile is not None else None
+            drift_monitor_version = loaded.version
+        return drift_monitor
+
+
+def track_drift(loaded, rows, predictions):
+    """
+    Adds served rows and their predictions to the drift windows (never fails a request).
+    Rows scored by a version that is no longer served are not tracked.
+    """
+    try:
+        monitor = current_drift_monitor()
+        if monitor is not None and loaded.version == drift_monitor_version:
+            monitor.update(rows, predictions)
+    except Exception as e:
+        print(f"⚠️ Drift tracking skipped: {e}")
+
+
+def align_features(df, model):
+    """
+    Adds missing model features (default 0) and reorders columns to match training.
+    """
+    expected_features = model.feature_names_in_ if hasattr(model, 'feature_names_in_') else df.columns
+
+    for col in expected_features:
+        if col not in df.columns:
+            df[col] = 0  # Default value for missing columns
+    return df[expected_features]  # Ensure correct order
+
+
+def normalize_categories(df):
+    """
+    Applies the training-time category mappings, so typos score like their canonical value.
+    """
+    return category_normalizer.transform(df) if category_normalizer is not None else df
+
+
+def predict_log_salary(loaded, df):
+    """
+    Scores aligned rows with the given LoadedModel. Uses the compiled NumPy
+    preprocessing path when available, otherwise the full sklearn pipeline.
+    """
+    df = align_features(df, loaded.model)
+    if loaded.fast_preprocessor is not None:
+        return loaded.model.named_steps['regressor'].predict(loaded.fast_preprocessor.transform(df))
+    return loaded.model.predict(df)
+
+
+def stream_batch_predictions(csv_path, output_format="csv", chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Scores a CSV chunk by chunk and yields predictions as CSV or NDJSON text.
+
+    Only one chunk is held in memory at a time, and each chunk is sent to the
+    client as soon as it has been scored. The file is deleted once streaming ends.
+
+    Parameters:
+        csv_path (str): Path to the spooled upload
+        output_format (str): "csv" or "ndjson"
+        chunk_size (int): Rows per model.predict call
+    """
+    try:
+        loaded = model_manager.current()  # Pin one version for the whole file
+        row_offset = 0
+        if output_format == "csv":
+            yield "row,predicted_salary\n"
+
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            chunk = normalize_categories(chunk)
+            # float64 first: rounded float32 values still print as e.g. 50171.96875
+            preds = np.round(np.expm1(predict_log_salary(loaded, chunk).astype(np.float64)), 2)  # Reverse log1p + round
+            track_drift(loaded, chunk, preds)
+            rows = np.arange(row_offset, row_offset + len(preds))
+            row_offset += len(preds)
+
+            if output_format == "csv":
+                yield "".join(f"{i},{p}\n" for i, p in zip(rows, preds))
+            else:
+                yield "".join(
+                    json.dumps({"row": int(i), "predicted_salary": float(p)}) + "\n"
+                    for i, p in zip(rows, preds)
+                )
+    finally:
+        os.remove(csv_path)
+
+def predict_salaries(df):
+    """
+    Vectorized scoring used by the micro-batcher: returns USD salaries for every row.
+    Records are already category-normalized by `api_predict`.
+    """
+    preds = predict_log_salary(model_manager.current(), df)
+    return np.round(np.expm1(preds.astype(np.float64)), 2)  # Reverse log1p + round
+
+
+batcher = MicroBatcher(predict_salaries, max_batch_size=API_MAX_BATCH_SIZE, max_wait_ms=API_MAX_WAIT_MS)
 
 @app.route('/')
 def home():
@@ -23,10 +188,24 @@ def home():
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
-        # --- 1️⃣ File Upload ---
+        # --- 1️⃣ File Upload (streamed batch scoring) ---
         if 'file' in request.files and request.files['file'].filename != '':
             file = request.files['file']
-            df = pd.read_csv(file)
+            output_format = request.form.get('format', request.args.get('format', 'csv')).lower()
+            if output_format not in ("csv", "ndjson"):
+                return f"<h3>❌ Error: Unsupported output format: {output_format}</h3>"
+
+            # Flask closes request files once the view returns, so spool the upload to disk first
+            with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+                file.save(tmp)
+
+            mimetype = "text/csv" if output_format == "csv" else "application/x-ndjson"
+            headers = {"Content-Disposition": f"attachment; filename=predictions.{output_format}"}
+            return Response(
+                stream_with_context(stream_batch_predictions(tmp.name, output_format)),
+                mimetype=mimetype,
+                headers=headers,
+            )
 
         # --- 2️⃣ Manual Input ---
         else:
@@ -40,18 +219,20 @@ def predict():
                 except ValueError:
                     pass  # Leave non-numeric as-is
 
-        # --- 3️⃣ Align Features with Model ---
-        expected_features = model.feature_names_in_ if hasattr(model, 'feature_names_in_') else df.columns
+        # --- 3️⃣ Normalize categories + Align Features with Model ---
+        loaded = model_manager.current()
+        df = normalize_categories(df)
+        raw_df = df.copy()  # align_features fills missing features in place
+        df = align_features(df, loaded.model)
 
-        for col in expected_features:
-            if col not in df.columns:
-                df[col] = 0  # Default value for missing columns
-        df = df[expected_features]  # Ensure correct order
-
-        # --- 4️⃣ Predict ---
-                # 4️⃣ Make Prediction
-        preds = model.predict(df)
-        predicted_salary = round(float(np.expm1(preds[0])), 2)  # Reverse log1p + round
+        # --- 4️⃣ Predict (memoized on the aligned feature vector) ---
+        cache_key = make_feature_key(df.iloc[0].to_dict(), df.columns)
+        predicted_salary = prediction_cache.get(cache_key, loaded.version)
+        if predicted_salary is None:
+            preds = predict_log_salary(loaded, df)
+            predicted_salary = round(float(np.expm1(preds[0])), 2)  # Reverse log1p + round
+            prediction_cache.put(cache_key, loaded.version, predicted_salary)
+        track_drift(loaded, raw_df, [predicted_salary])
 
         return render_template("data.html", prediction=predicted_salary)
 
@@ -59,5 +240,91 @@ def predict():
     except Exception as e:
         return f"<h3>❌ Error: {str(e)}</h3>"
 
+@app.route('/api/v1/predict', methods=['POST'])
+def api_predict():
+    """
+    JSON prediction API. Accepts a single record (object) or a list of records.
+    Concurrent requests are coalesced into shared predict calls by the micro-batcher.
+    Records that cannot be scored are reported by index with a 400.
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        records, single = [payload], True
+    elif isinstance(payload, list) and payload and all(isinstance(r, dict) for r in payload):
+        records, single = payload, False
+    else:
+        return jsonify({"error": "Expected a JSON object or a non-empty list of objects"}), 400
+
+    if category_normalizer is not None:
+        records = [category_normalizer.normalize_record(record) for record in records]
+
+    loaded = model_manager.current()
+    version = loaded.version
+    features = getattr(loaded.model, 'feature_names_in_', None)
+    keys = [make_feature_key(record, features) if features is not None else None for record in records]
+
+    # Serve repeats from the cache; only misses go through the micro-batcher, which
+    # retries a failed batch record by record so each future fails only for its own record
+    preds = [prediction_cache.get(key, version) if key is not None else None for key in keys]
+    futures = {i: batcher.submit(records[i]) for i, pred in enumerate(preds) if pred is None}
+    errors = []
+    for i, future in futures.items():
+        try:
+            preds[i] = float(future.result(timeout=API_TIMEOUT_S))
+        except API_CLIENT_ERRORS as e:
+            errors.append({"record": i, "error": str(e)})
+            continue
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        if keys[i] is not None and model_manager.current().version == version:
+            prediction_cache.put(keys[i], version, preds[i])
+
+    if errors:
+        if single:
+            return jsonify(errors[0]), 400
+        return jsonify({"error": f"{len(errors)} of {len(records)} records could not be scored",
+                        "errors": errors}), 400
+
+    track_drift(loaded, records, preds)
+    if single:
+        return jsonify({"predicted_salary": preds[0]})
+    return jsonify({"predicted_salary": preds})
+
+@app.route('/api/v1/cache/stats', methods=['GET'])
+def api_cache_stats():
+    """
+    Reports prediction cache hit/miss counters for the active model version.
+    """
+    return jsonify(prediction_cache.stats())
+
+@app.route('/api/v1/drift', methods=['GET'])
+def api_drift():
+    """
+    Scores the live traffic window against the reference profile of the served model.
+    """
+    monitor = current_drift_monitor()
+    if monitor is None:
+        return jsonify({"error": f"No reference profile for model version {model_manager.current().version}"}), 404
+    return jsonify({"model_version": drift_monitor_version, **monitor.snapshot()})
+
+@app.route('/api/v1/model', methods=['GET'])
+def api_model_info():
+    """
+    Reports the active model version and the warm versions available for rollback.
+    """
+    return jsonify({"version": model_manager.current().version, "warm_versions": model_manager.versions()})
+
+@app.route('/api/v1/model/rollback', methods=['POST'])
+def api_model_rollback():
+    """
+    Switches back to a warm model version (default: the previous one).
+    """
+    version = (request.get_json(silent=True) or {}).get("version")
+    try:
+        active = model_manager.rollback(version)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"version": active.version})
+
 if __name__ == "__main__":
     app.run(debug=True,port=5001)
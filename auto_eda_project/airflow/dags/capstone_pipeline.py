@@ -1,5 +1,5 @@
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 from airflow.operators.trigger_dagrun import TriggerDagRunOperator
 from datetime import datetime, timedelta
 import os
@@ -7,20 +7,36 @@ import sys
 
 # Add your project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "auto_eda_project")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
 
-from db.db_loader import load_from_postgres
+from data_ingestion.data_loader import load_data
 from preprocessing.cat_typo_cleaner import clean_categorical_typos
-from model.train_model import train_models
+from model.train_model import train_models, TRAINING_CONFIG_VERSION
 from model.evaluate_model import evaluate_model
-from drift.drift_detector import detect_drift_and_save
-from mlflow.utils import compare_and_register_models
+from model.incremental import incremental_retrain
+from auto_eda_project.evidently_ai.evidently_drift import check_drift
+from auto_eda_project.evidently_ai.reference_profile import reference_profile_path
+from auto_eda_project.cache.artifact_store import ArtifactStore
+from auto_eda_project.cache.dataset_cache import fingerprint_frame, atomic_write_json
+import hashlib
+import json
 import joblib
 import pandas as pd
 
 # 🔧 Config
 TARGET = "adjusted_total_usd"
+TABLE_NAME = "software_salaries"
+WATERMARK_COLUMN = "id"  # Monotonically increasing column; only newer rows are fetched each run
+KEY_COLUMNS = None       # Set (e.g. ["id"]) with an updated_at watermark to merge updated rows
 MODEL_SAVE_PATH = "auto_eda_project/save_model/best_capstone_model.pkl"
 FLASK_DEPLOY_SCRIPT = "flask/deploy_flask.sh"  # optional deployment script
+DATASET_ARTIFACT = "salaries_clean"  # Handed between tasks as a file; XCom only carries its path + hash
+PIPELINE_STATE_PATH = "auto_eda_project/cache/pipeline_state.json"  # Fingerprint of the last successful run
+INCREMENTAL_RETRAIN = True           # New data without drift: continue the current model instead of a full grid search
+INCREMENTAL_RECENT_ROWS = 100_000    # Most recent rows used for the update (None = all)
+INCREMENTAL_MAX_REGRESSION = 0.05    # Full search if holdout RMSE is >5% worse than the current model
+
+artifact_store = ArtifactStore()
 
 # DAG definition
 default_args = {
@@ -40,20 +56,94 @@ dag = DAG(
 
 # ---------------------------- TASK FUNCTIONS ----------------------------
 
+def load_salaries():
+    # Pooled engine + local snapshot: each run only fetches rows past the stored watermark
+    return load_data(from_db=True, table_name=TABLE_NAME, watermark_column=WATERMARK_COLUMN,
+                     key_columns=KEY_COLUMNS, optimize_dtypes=True)
+
 def load_data_from_db(**kwargs):
-    df = load_from_postgres(table_name="software_salaries")
+    df = load_salaries()
     df = clean_categorical_typos(df)
-    kwargs['ti'].xcom_push(key="df", value=df)
+    kwargs['ti'].xcom_push(key="dataset", value=artifact_store.put(df, DATASET_ARTIFACT))
+
+def pull_dataset(ti):
+    return artifact_store.get(ti.xcom_pull(key="dataset", task_ids="load_data_from_postgres"))
+
+def pipeline_fingerprint(df):
+    # Data (row count, max watermark, sampled row hash) + training config version
+    data_fingerprint = fingerprint_frame(df, watermark_column=WATERMARK_COLUMN)
+    return hashlib.sha256(f"{data_fingerprint}|{TARGET}|{TRAINING_CONFIG_VERSION}".encode()).hexdigest()
+
+def read_pipeline_state():
+    if not os.path.exists(PIPELINE_STATE_PATH):
+        return {}
+    try:
+        with open(PIPELINE_STATE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def check_data_changed(**kwargs):
+    """
+    Short-circuits training and deployment when the input data and training config
+    match the last successful run (and its model is still on disk).
+    """
+    fingerprint = pipeline_fingerprint(pull_dataset(kwargs['ti']))
+    kwargs['ti'].xcom_push(key="fingerprint", value=fingerprint)
+
+    last = read_pipeline_state()
+    if last.get("fingerprint") == fingerprint and os.path.exists(MODEL_SAVE_PATH):
+        print(f"⏭️ Data and training config unchanged since run {last.get('run_id')} "
+              f"({last.get('completed_at')}). Skipping training.")
+        return False
+    print(f"🆕 Data or training config changed (fingerprint {fingerprint[:12]}). Training.")
+    return True
+
+def record_successful_run(**kwargs):
+    atomic_write_json(PIPELINE_STATE_PATH, {
+        "fingerprint": kwargs['ti'].xcom_pull(key="fingerprint", task_ids="check_data_changed"),
+        "training_config_version": TRAINING_CONFIG_VERSION,
+        "retrain_mode": kwargs['ti'].xcom_pull(key="retrain_mode", task_ids="train_and_evaluate_model"),
+        "run_id": kwargs.get('run_id'),
+        "completed_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    print(f"📝 Recorded successful run in {PIPELINE_STATE_PATH}")
+
+def needs_full_search(ti):
+    # Drift, a new training config or no current model: the current hyperparameters no longer apply
+    if not INCREMENTAL_RETRAIN or not os.path.exists(MODEL_SAVE_PATH):
+        return "no current model" if INCREMENTAL_RETRAIN else "incremental retraining disabled"
+    if ti.xcom_pull(key="drift_detected", task_ids="detect_data_drift"):
+        return "drift detected"
+    if read_pipeline_state().get("training_config_version") != TRAINING_CONFIG_VERSION:
+        return "training config changed"
+    return None
 
 def train_and_evaluate(**kwargs):
-    df = kwargs['ti'].xcom_pull(key="df")
-    model, X_test, y_test, run_metrics_dict = train_models(df, target=TARGET, save_path=MODEL_SAVE_PATH)
+    """
+    Runs only when the data or training config changed (see check_data_changed).
+    New data without drift continues the current model (no search); the full grid
+    search runs on drift, a config change, or when the incremental update regresses.
+    """
+    ti = kwargs['ti']
+    df = pull_dataset(ti)
+    reason = needs_full_search(ti)
+
+    if reason is None:
+        print("🔁 New data, no drift. Incrementally updating the current model...")
+        # Registers an accepted model and moves its reference profile to this data
+        result = incremental_retrain(df, target=TARGET, model_path=MODEL_SAVE_PATH,
+                                     recent_rows=INCREMENTAL_RECENT_ROWS, max_regression=INCREMENTAL_MAX_REGRESSION)
+        if result["accepted"]:
+            ti.xcom_push(key="retrain_mode", value="incremental")
+            return
+        reason = "incremental update regressed on the holdout"
+
+    print(f"🧪 Full search ({reason})...")
+    # train_models logs every family to MLflow and registers the best model itself
+    model, X_test, y_test = train_models(df, target=TARGET, save_path=MODEL_SAVE_PATH)
     evaluate_model(model, X_test, y_test)
-    kwargs['ti'].xcom_push(key="run_metrics", value=run_metrics_dict)
-
-def register_best_model(**kwargs):
-    run_metrics_dict = kwargs['ti'].xcom_pull(key="run_metrics")
-    compare_and_register_models(run_metrics_dict, model_name_prefix="BestSalaryModel")
+    ti.xcom_push(key="retrain_mode", value="full")
 
 def trigger_flask_deployment():
     if os.path.exists(FLASK_DEPLOY_SCRIPT):
@@ -63,24 +153,17 @@ def trigger_flask_deployment():
         print("⚠️ Flask deployment script not found.")
 
 def detect_data_drift(**kwargs):
-    drift_result = detect_drift_and_save(
-        train_path="auto_eda_project/Data/train.csv",
-        test_path="auto_eda_project/Data/test.csv",
-        output_html_path="auto_eda_project/reports/train_vs_test_drift.html"
-    )
+    # Scored against the reference profile saved with the model (no reference data reload),
+    # before anything in this run replaces the model or its profile
+    profile_path = reference_profile_path(MODEL_SAVE_PATH)
+    if not os.path.exists(profile_path):
+        print("⚠️ No reference profile yet. Skipping drift check.")
+        kwargs['ti'].xcom_push(key="drift_detected", value=False)
+        return
+    df = pull_dataset(kwargs['ti'])
+    drift_result = check_drift(df, profile_path=profile_path, log_to_mlflow=True)
     kwargs['ti'].xcom_push(key="drift_detected", value=drift_result.get("drift_detected", False))
 
-def retrain_if_drift(**kwargs):
-    if kwargs['ti'].xcom_pull(key="drift_detected"):
-        print("🔁 Drift detected. Retraining model...")
-        df = load_from_postgres(table_name="software_salaries")
-        df = clean_categorical_typos(df)
-        model, X_test, y_test, run_metrics_dict = train_models(df, target=TARGET, save_path=MODEL_SAVE_PATH)
-        evaluate_model(model, X_test, y_test)
-        compare_and_register_models(run_metrics_dict, model_name_prefix="BestSalaryModel")
-    else:
-        print("✅ No drift detected. Skipping retraining.")
-
 # ---------------------------- TASKS ----------------------------
 
 load_task = PythonOperator(
@@ -90,16 +173,16 @@ load_task = PythonOperator(
     dag=dag
 )
 
-train_task = PythonOperator(
-    task_id="train_and_evaluate_model",
-    python_callable=train_and_evaluate,
+check_task = ShortCircuitOperator(
+    task_id="check_data_changed",
+    python_callable=check_data_changed,
     provide_context=True,
     dag=dag
 )
 
-register_task = PythonOperator(
-    task_id="register_best_model",
-    python_callable=register_best_model,
+train_task = PythonOperator(
+    task_id="train_and_evaluate_model",
+    python_callable=train_and_evaluate,
     provide_context=True,
     dag=dag
 )
@@ -110,19 +193,22 @@ deploy_task = PythonOperator(
     dag=dag
 )
 
-drift_task = PythonOperator(
-    task_id="detect_data_drift",
-    python_callable=detect_data_drift,
+record_task = PythonOperator(
+    task_id="record_successful_run",
+    python_callable=record_successful_run,
     provide_context=True,
     dag=dag
 )
 
-retrain_task = PythonOperator(
-    task_id="retrain_if_drift_detected",
-    python_callable=retrain_if_drift,
+drift_task = PythonOperator(
+    task_id="detect_data_drift",
+    python_callable=detect_data_drift,
     provide_context=True,
     dag=dag
 )
 
 # DAG Flow
-load_task >> train_task >> register_task >> deploy_task >> drift_task >> retrain_task
+# Drift is scored on every load, against the current model's profile; check_task then skips
+# training and deployment when the data and training config are unchanged. One branch, so
+# only train_task writes the model and profile and only record_task writes the state file.
+load_task >> drift_task >> check_task >> train_task >> deploy_task >> record_task
@@ -0,0 +1,123 @@
+import glob
+import os
+import time
+
+import pandas as pd
+
+from auto_eda_project.cache.dataset_cache import atomic_temp_path, hash_file
+
+# Hands DataFrames between pipeline tasks as content-addressed Arrow IPC files on a
+# shared path. Only a small reference (path + sha256) travels through XCom, instead
+# of a pickled frame in the metadata database. Readers memory-map the file and
+# `to_pandas()` copies it into pandas memory.
+
+ARTIFACT_DIR = os.environ.get(
+    "CAPSTONE_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "artifacts"),
+)
+ARTIFACT_SUFFIX = ".arrow"
+RETENTION_S = 7 * 24 * 3600
+KEEP_LAST = 3
+TMP_MAX_AGE_S = 3600  # Half-written files older than this belong to crashed writers
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of DataFrames for task-to-task handoff.
+
+    `put` writes an uncompressed Arrow file named after its sha256 (identical data
+    is stored once) and returns a JSON-serializable reference for XCom. `get`
+    reads the file back through a memory map. Artifacts older than `retention_s` are removed by
+    `gc`, except the newest `keep_last` of each name, which a retried downstream
+    task may still need.
+
+    Parameters:
+        root (str): Shared directory holding the artifacts
+        retention_s (float): Age after which an artifact may be removed
+        keep_last (int): Newest artifacts kept per name regardless of age
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, retention_s=RETENTION_S, keep_last=KEEP_LAST):
+        self.root = root
+        self.retention_s = retention_s
+        self.keep_last = keep_last
+        os.makedirs(root, exist_ok=True)
+
+    def _entries(self, name="*"):
+        return glob.glob(os.path.join(self.root, f"{name}-*{ARTIFACT_SUFFIX}"))
+
+    def put(self, df: pd.DataFrame, name: str) -> dict:
+        """
+        Stores a frame and returns its reference.
+
+        Returns:
+            dict: {"name", "path", "sha256", "rows", "columns", "bytes"}
+        """
+        import pyarrow.feather as feather
+
+        with atomic_temp_path(self.root) as tmp_path:
+            # Uncompressed so readers map the file and skip decompression
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+            sha256 = hash_file(tmp_path)
+            path = os.path.join(self.root, f"{name}-{sha256[:16]}{ARTIFACT_SUFFIX}")
+            if os.path.exists(path):
+                os.utime(path)  # Same content already stored: refresh its age
+            else:
+                os.replace(tmp_path, path)
+
+        ref = {"name": name, "path": os.path.abspath(path), "sha256": sha256, "rows": len(df),
+               "columns": df.shape[1], "bytes": os.path.getsize(path)}
+        print(f"📤 Stored artifact {name}: {ref['path']} ({ref['rows']} rows, {ref['bytes'] / 1024 ** 2:.1f} MB)")
+        self.gc()
+        return ref
+
+    def get(self, ref: dict, verify: bool = False) -> pd.DataFrame:
+        """
+        Loads the artifact behind a reference (memory-mapped read, copied into pandas).
+
+        Parameters:
+            ref (dict): Reference returned by `put`
+            verify (bool): Re-hash the file and compare with the reference
+                (reads the whole file once; size is always checked)
+        """
+        import pyarrow.feather as feather
+
+        path = ref["path"]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Artifact missing (garbage-collected or not shared?): {path}")
+        if os.path.getsize(path) != ref["bytes"] or (verify and hash_file(path) != ref["sha256"]):
+            raise ValueError(f"Artifact does not match its reference: {path}")
+
+        df = feather.read_table(path, memory_map=True).to_pandas()
+        print(f"📥 Loaded artifact {ref['name']}: {path} | Shape: {df.shape}")
+        return df
+
+    def gc(self, now: float = None) -> list:
+        """
+        Applies the retention policy and removes stale temporary files.
+
+        Returns:
+            list: Removed paths
+        """
+        now = now or time.time()
+        by_name = {}
+        for path in self._entries():
+            name = os.path.basename(path)[:-len(ARTIFACT_SUFFIX)].rsplit("-", 1)[0]
+            by_name.setdefault(name, []).append(path)
+
+        removed = []
+        for paths in by_name.values():
+            paths.sort(key=os.path.getmtime, reverse=True)
+            for path in paths[self.keep_last:]:
+                if now - os.path.getmtime(path) > self.retention_s:
+                    os.remove(path)
+                    removed.append(path)
+
+        for tmp_path in glob.glob(os.path.join(self.root, "*.tmp")):
+            if now - os.path.getmtime(tmp_path) > TMP_MAX_AGE_S:
+                os.remove(tmp_path)
+                removed.append(tmp_path)
+
+        for path in removed:
+            print(f"🗑️ Removed expired artifact: {path}")
+        return removed
@@ -0,0 +1,227 @@
+import glob
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Cleaned datasets are cached as uncompressed Arrow IPC (Feather v2) files, so a hit
+# skips parsing and cleaning: the file is memory-mapped and decoded without a
+# decompression pass. `to_pandas()` still copies the columns into pandas memory.
+
+CACHE_SUFFIX = ".arrow"
+HASH_BLOCK_SIZE = 1 << 20  # 1 MiB
+
+
+def fingerprint_file(path: str, index_path: str = None) -> str:
+    """
+    Returns the sha256 of a file's contents.
+
+    When `index_path` is given, digests are memoized there by (path, size, mtime),
+    so an unchanged file is not re-read on every run.
+    """
+    stat = os.stat(path)
+    stamp = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    index = {}
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        if stamp in index:
+            return index[stamp]
+
+    digest = hash_file(path)
+
+    if index_path:
+        index = {k: v for k, v in index.items() if not k.startswith(f"{os.path.abspath(path)}|")}
+        index[stamp] = digest
+        atomic_write_json(index_path, index)
+    return digest
+
+
+def hash_file(path: str) -> str:
+    """
+    Returns the sha256 hex digest of a file, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint_table(engine, table_name: str, schema: str = "public") -> str:
+    """
+    Returns a cheap snapshot token for a PostgreSQL table: the insert/update/delete
+    counters tracked by the statistics collector, which change on every write.
+    """
+    from sqlalchemy import text
+
+    query = text(
+        "SELECT n_tup_ins, n_tup_upd, n_tup_del, n_live_tup FROM pg_stat_user_tables "
+        "WHERE schemaname = :schema AND relname = :table"
+    )
+    with engine.connect() as conn:
+        row = conn.execute(query, {"schema": schema, "table": table_name}).fetchone()
+    if row is None:
+        raise ValueError(f"Table not found: {schema}.{table_name}")
+    return hashlib.sha256(f"{schema}.{table_name}|{tuple(row)}".encode()).hexdigest()
+
+
+def fingerprint_frame(df: pd.DataFrame, watermark_column: str = None, sample_rows: int = 10_000) -> str:
+    """
+    Returns a cheap fingerprint of a loaded dataset: row count, schema, max
+    watermark and a hash of `sample_rows` evenly spaced rows. Appended, deleted or
+    retyped data changes it without hashing the whole table.
+    """
+    step = max(1, len(df) // sample_rows)
+    row_hashes = pd.util.hash_pandas_object(df.iloc[::step], index=False).to_numpy()
+
+    watermark = None
+    if watermark_column and watermark_column in df.columns and len(df):
+        watermark = str(df[watermark_column].max())
+
+    digest = hashlib.sha256()
+    digest.update(f"{len(df)}|{list(map(str, df.columns))}|{list(map(str, df.dtypes))}|{watermark}".encode())
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+def code_fingerprint(*functions) -> str:
+    """
+    Hashes the source of the cleaning functions (or whole modules, to include their
+    constants), so editing them invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    for func in functions:
+        digest.update(inspect.getsource(func).encode())
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_temp_path(directory: str):
+    """
+    Yields a temporary file path in `directory` for the caller to write and then
+    `os.replace` onto its final name (atomic on the same filesystem). The file is
+    removed if it was not moved. It gets the umask-based mode a plain open() would
+    give it, not mkstemp's owner-only 0600, so other users can read the result.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    try:
+        yield tmp_path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def atomic_write_json(path, payload, **json_kwargs):
+    # json_kwargs go to json.dump (e.g. indent=2 for files meant to be read or diffed)
+    with atomic_temp_path(os.path.dirname(os.path.abspath(path))) as tmp_path:
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, **json_kwargs)
+        os.replace(tmp_path, path)
+
+
+class DatasetCache:
+    """
+    Disk cache of cleaned DataFrames keyed on (source fingerprint, cleaning-code fingerprint).
+
+    A changed source file/table or changed cleaning code produces a new key, and
+    older entries of the same dataset are deleted when the new one is stored.
+    Entries are read through a memory map (then copied into pandas by
+    `to_pandas()`); a hit refreshes the entry's mtime and
+    the least recently used entries are evicted once the cache exceeds `max_bytes`.
+
+    Parameters:
+        cache_dir (str): Directory holding the cache files
+        max_bytes (int): Size budget for all cached datasets
+    """
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, "fingerprints.json")
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+    def _path(self, name, key):
+        return os.path.join(self.cache_dir, f"{name}-{key}{CACHE_SUFFIX}")
+
+    def _entries(self, name="*"):
+        return glob.glob(os.path.join(self.cache_dir, f"{name}-*{CACHE_SUFFIX}"))
+
+    def get(self, name: str, key: str):
+        """
+        Returns the cached frame for (name, key), or None on a miss.
+        """
+        import pyarrow.feather as feather
+
+        path = self._path(name, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = feather.read_table(path, memory_map=True).to_pandas()
+        except Exception as e:
+            print(f"⚠️ Discarding unreadable cache entry {path}: {e}")
+            os.remove(path)
+            return None
+        os.utime(path)  # LRU bookkeeping
+        print(f"⚡ Loaded cleaned dataset from cache: {path} | Shape: {df.shape}")
+        return df
+
+    def put(self, name: str, key: str, df: pd.DataFrame) -> str:
+        """
+        Stores a frame under (name, key), drops stale entries of the same dataset
+        and enforces the size budget.
+
+        Returns:
+            str: Path of the cache file
+        """
+        import pyarrow.feather as feather
+
+        path = self._path(name, key)
+        with atomic_temp_path(self.cache_dir) as tmp_path:
+            # Uncompressed so reads map the file and skip decompression
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+
+        for stale in self._entries(name):
+            if stale != path:
+                os.remove(stale)
+        self.evict()
+        print(f"💾 Cached cleaned dataset: {path}")
+        return path
+
+    def evict(self):
+        """
+        Removes least recently used entries until the cache fits in `max_bytes`
+        (the most recent entry is always kept).
+        """
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        total = sum(os.path.getsize(p) for p in entries)
+        while len(entries) > 1 and total > self.max_bytes:
+            oldest = entries.pop(0)
+            total -= os.path.getsize(oldest)
+            os.remove(oldest)
+            print(f"🗑️ Evicted cached dataset: {oldest}")
+
+    def clear(self):
+        for path in self._entries():
+            os.remove(path)
@@ -1,9 +1,23 @@
 # auto_eda_project/data_ingestion/data_loader.py
 
 import os
+import json
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
+from pandas.api.types import union_categoricals
+from sqlalchemy import create_engine, text
 from auto_eda_project.db.db_connect import get_engine
+from auto_eda_project.cache.dataset_cache import atomic_temp_path
+
+# Object columns whose distinct/non-null ratio (in the first chunk) is at or below
+# this threshold are stored as `category` (job_title, country, ...)
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Local snapshots for incremental DB loads (watermark stored in the Parquet metadata)
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "snapshots")
+WATERMARK_METADATA_KEY = b"capstone.watermark"
 
 
 class DataIngestionError(Exception):
@@ -11,15 +25,280 @@ class DataIngestionError(Exception):
     pass
 
 
-def load_data(file_path: str = None, from_db: bool = False, table_name: str = None, schema: str = 'public') -> pd.DataFrame:
+def infer_category_columns(df: pd.DataFrame, max_unique_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> list:
+    """
+    Picks the low-cardinality string columns of a (sample) frame.
+    """
+    category_cols = []
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) or not pd.api.types.is_string_dtype(df[col]):
+            continue
+        non_null = df[col].count()
+        if non_null and df[col].nunique(dropna=True) / non_null <= max_unique_ratio:
+            category_cols.append(col)
+    return category_cols
+
+
+def optimize_frame_dtypes(df: pd.DataFrame, category_cols=()) -> pd.DataFrame:
+    """
+    Replaces default dtypes with compact ones:
+    integers are downcast to the smallest signed type, floats become float32 only
+    when every value survives the round trip exactly, and `category_cols` become
+    `category`.
+
+    Parameters:
+        df (pd.DataFrame): Frame to optimize (modified and returned)
+        category_cols (list): String columns to store as category
+
+    Returns:
+        pd.DataFrame: The optimized frame
+    """
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    for col in df.select_dtypes(include='float64').columns:
+        values = df[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        # Lossless only: NaNs stay NaN, every other value must round-trip bit-exact
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            df[col] = narrowed
+
+    for col in category_cols:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def concat_chunks(chunks) -> pd.DataFrame:
+    """
+    Concatenates optimized chunks without losing `category` dtypes.
+
+    `pd.concat` falls back to object when chunk categories differ, so each
+    categorical column is first recoded onto the union of its categories.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+
+    for col in chunks[0].select_dtypes(include='category').columns:
+        parts = [chunk[col] for chunk in chunks if col in chunk.columns]
+        if not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        categories = union_categoricals(parts, ignore_order=True).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+
+def _table_ref(table_name, schema):
+    return f"{schema}.{table_name}" if schema else table_name
+
+
+def _iter_raw_chunks(file_path, from_db, table_name, schema, chunksize, where=None, params=None, engine=None):
+    # Yields default-dtype chunks from the database or a file
+    if from_db:
+        engine = engine or get_engine()
+        query = f"SELECT * FROM {_table_ref(table_name, schema)}"
+        if where:
+            query += f" WHERE {where}"
+        # Server-side cursor: rows are fetched `chunksize` at a time instead of all at once
+        with engine.connect().execution_options(stream_results=True) as conn:
+            yield from pd.read_sql(text(query), con=conn, params=params, chunksize=chunksize)
+        return
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.csv':
+        yield from pd.read_csv(file_path, chunksize=chunksize)
+    elif ext == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif ext in ['.jsonl', '.ndjson']:
+        yield from pd.read_json(file_path, lines=True, chunksize=chunksize)
+    elif ext in ['.xls', '.xlsx', '.json']:
+        # No streaming reader for these formats: read once, then hand out slices
+        print(f"⚠️ {ext} cannot be read incrementally; loading the whole file before chunking.")
+        df = pd.read_excel(file_path) if ext != '.json' else pd.read_json(file_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].copy()
+    else:
+        raise DataIngestionError(f"Unsupported file format: {ext}")
+
+
+def iter_data_chunks(file_path: str = None, from_db: bool = False, table_name: str = None,
+                     schema: str = 'public', chunksize: int = DEFAULT_CHUNKSIZE,
+                     optimize_dtypes: bool = True, category_cols=None, where: str = None,
+                     params: dict = None, engine=None):
+    """
+    Streams a file or PostgreSQL table as DataFrame chunks of at most `chunksize` rows.
+
+    Args:
+        file_path (str): Path to a CSV, Parquet, JSON Lines, Excel or JSON file.
+        from_db (bool): If True, streams the PostgreSQL table instead.
+        table_name (str): Table name in PostgreSQL (required if from_db=True).
+        schema (str): Schema name (default is 'public').
+        chunksize (int): Rows per chunk.
+        optimize_dtypes (bool): Downcast numerics and store low-cardinality strings as category.
+        category_cols (list): Columns to store as category (default: inferred from the first chunk).
+        where (str): Optional SQL filter for the table (bind parameters go in `params`).
+        params (dict): Bind parameters for `where`.
+        engine: SQLAlchemy engine (default: the pooled `get_engine()`).
+
+    Yields:
+        pd.DataFrame: One chunk at a time.
+
+    Raises:
+        DataIngestionError: If loading fails.
+    """
+    if from_db and not table_name:
+        raise DataIngestionError("Table name must be specified when loading from database.")
+    if not from_db and (not file_path or not os.path.exists(file_path)):
+        raise DataIngestionError(f"File not found: {file_path}")
+
+    try:
+        for chunk in _iter_raw_chunks(file_path, from_db, table_name, schema, chunksize,
+                                      where=where, params=params, engine=engine):
+            if optimize_dtypes:
+                if category_cols is None:
+                    category_cols = infer_category_columns(chunk)  # Decided once, on the first chunk
+                chunk = optimize_frame_dtypes(chunk, category_cols)
+            yield chunk
+    except DataIngestionError:
+        raise
+    except Exception as e:
+        source = _table_ref(table_name, schema) if from_db else file_path
+        raise DataIngestionError(f"Failed to load data in chunks from {source}: {str(e)}")
+
+
+def _encode_watermark(column, value):
+    if isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, "isoformat"):
+        return {"column": column, "type": "datetime", "value": pd.Timestamp(value).isoformat()}
+    if isinstance(value, (int, np.integer)):
+        return {"column": column, "type": "int", "value": int(value)}
+    if isinstance(value, (float, np.floating)):
+        return {"column": column, "type": "float", "value": float(value)}
+    return {"column": column, "type": "str", "value": str(value)}
+
+
+def _decode_watermark(state):
+    if state["type"] == "datetime":
+        return pd.Timestamp(state["value"]).to_pydatetime()
+    return {"int": int, "float": float}.get(state["type"], str)(state["value"])
+
+
+def _read_snapshot(snapshot_path):
+    # Returns (frame, watermark state) or (None, None) when there is no usable snapshot
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(snapshot_path):
+        return None, None
+    table = pq.read_table(snapshot_path, memory_map=True)
+    state = (table.schema.metadata or {}).get(WATERMARK_METADATA_KEY)
+    if state is None:
+        return None, None
+    return table.to_pandas(), json.loads(state)
+
+
+def _write_snapshot(snapshot_path, df, state):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[WATERMARK_METADATA_KEY] = json.dumps(state).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Snapshot and watermark live in one file, replaced atomically
+    with atomic_temp_path(os.path.dirname(snapshot_path)) as tmp_path:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, snapshot_path)
+
+
+def load_incremental(table_name: str, watermark_column: str, schema: str = 'public', key_columns=None,
+                     snapshot_dir: str = SNAPSHOT_DIR, chunksize: int = DEFAULT_CHUNKSIZE,
+                     optimize_dtypes: bool = True, engine=None) -> pd.DataFrame:
+    """
+    Loads a table incrementally: only rows with `watermark_column` above the last
+    seen value are fetched and merged into a local Parquet snapshot.
+
+    The first call (or a call with a different watermark column) does a full load.
+    With `key_columns`, fetched rows replace snapshot rows with the same key (use an
+    `updated_at`-style watermark to pick up updates); without them, new rows are appended.
+
+    Args:
+        table_name (str): Table name in PostgreSQL.
+        watermark_column (str): Monotonically increasing column (serial id or timestamp).
+        schema (str): Schema name (default is 'public').
+        key_columns (list): Primary key used to merge updated rows.
+        snapshot_dir (str): Directory holding the local snapshots.
+        chunksize (int): Rows per fetched chunk.
+        optimize_dtypes (bool): Downcast numerics and store low-cardinality strings as category.
+        engine: SQLAlchemy engine (default: the pooled `get_engine()`).
+
+    Returns:
+        pd.DataFrame: The up-to-date table.
+
+    Raises:
+        DataIngestionError: If loading fails.
+    """
+    source = _table_ref(table_name, schema)
+    snapshot_path = os.path.join(snapshot_dir, f"{source}.parquet")
+    snapshot, state = _read_snapshot(snapshot_path)
+    if state is not None and state["column"] != watermark_column:
+        snapshot, state = None, None
+
+    engine = engine or get_engine()
+    where, params = None, None
+    if state is not None:
+        # The column name is an identifier, not a bind parameter: quote it for the dialect
+        column = engine.dialect.identifier_preparer.quote(watermark_column)
+        where, params = f"{column} > :watermark", {"watermark": _decode_watermark(state)}
+    category_cols = snapshot.select_dtypes(include='category').columns.tolist() if snapshot is not None else None
+
+    delta = concat_chunks(iter_data_chunks(
+        from_db=True, table_name=table_name, schema=schema, chunksize=chunksize,
+        optimize_dtypes=optimize_dtypes, category_cols=category_cols, where=where, params=params,
+        engine=engine,
+    ))
+    if delta.empty:
+        print(f"✅ No new rows in {source} since {watermark_column} = {state['value'] if state else None}")
+        return snapshot if snapshot is not None else delta
+
+    if snapshot is None:
+        df = delta
+    else:
+        df = concat_chunks([snapshot, delta])
+        if key_columns:
+            df = df.drop_duplicates(subset=key_columns, keep='last', ignore_index=True)
+
+    state = _encode_watermark(watermark_column, delta[watermark_column].max())
+    _write_snapshot(snapshot_path, df, state)
+    print(f"🔁 Incremental load of {source}: +{len(delta):,} rows | Snapshot: {len(df):,} rows | "
+          f"{watermark_column} <= {state['value']}")
+    return df
+
+
+def load_data(file_path: str = None, from_db: bool = False, table_name: str = None, schema: str = 'public',
+              chunksize: int = None, optimize_dtypes: bool = False, category_cols=None,
+              watermark_column: str = None, key_columns=None) -> pd.DataFrame:
     """
     Load data from CSV/Excel/JSON/Parquet or from PostgreSQL database.
 
+    With `chunksize` or `optimize_dtypes`, the source is read chunk by chunk and each
+    chunk is shrunk before the next one is read, so peak memory is roughly the
+    optimized frame plus one raw chunk instead of the full default-dtype frame.
+
     Args:
         file_path (str): File path to CSV, Excel, etc.
         from_db (bool): If True, loads from PostgreSQL table.
         table_name (str): Table name in PostgreSQL (required if from_db=True).
         schema (str): Schema name (default is 'public').
+        chunksize (int): Rows per chunk for memory-bounded loading.
+        optimize_dtypes (bool): Downcast numerics and store low-cardinality strings as category.
+        category_cols (list): Columns to store as category (default: inferred from the first chunk).
+        watermark_column (str): With from_db=True, load incrementally (see `load_incremental`).
+        key_columns (list): Primary key for merging updated rows in incremental mode.
 
     Returns:
         pd.DataFrame: Loaded data.
@@ -27,6 +306,23 @@ def load_data(file_path: str = None, from_db: bool = False, table_name: str = No
     Raises:
         DataIngestionError: If loading fails.
     """
+    if from_db and watermark_column:
+        if not table_name:
+            raise DataIngestionError("Table name must be specified when loading from database.")
+        return load_incremental(table_name, watermark_column, schema=schema, key_columns=key_columns,
+                                chunksize=chunksize or DEFAULT_CHUNKSIZE, optimize_dtypes=optimize_dtypes)
+
+    if chunksize or optimize_dtypes:
+        df = concat_chunks(iter_data_chunks(
+            file_path=file_path, from_db=from_db, table_name=table_name, schema=schema,
+            chunksize=chunksize or DEFAULT_CHUNKSIZE, optimize_dtypes=optimize_dtypes,
+            category_cols=category_cols,
+        ))
+        source = f"PostgreSQL: {schema}.{table_name}" if from_db else f"file: {file_path}"
+        memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        print(f"📦 Loaded {source} in chunks | Shape: {df.shape} | Memory: {memory_mb:.1f} MB")
+        return df
+
     if from_db:
         if not table_name:
             raise DataIngestionError("Table name must be specified when loading from database.")
@@ -63,3 +359,84 @@ def load_data(file_path: str = None, from_db: bool = False, table_name: str = No
 
     except Exception as e:
         raise DataIngestionError(f"Failed to load file: {str(e)}")
+
+
+# ---------------------------- Benchmark ----------------------------
+
+def _write_synthetic_salaries(path, n_rows, seed=42):
+    # Salary-shaped CSV: a few low-cardinality strings plus integer and float columns
+    rng = np.random.default_rng(seed)
+    titles = [f"job title {i}" for i in range(40)]
+    countries = [f"country {i}" for i in range(60)]
+    pd.DataFrame({
+        'job_title': rng.choice(titles, n_rows),
+        'experience_level': rng.choice(['EN', 'MI', 'SE', 'EX'], n_rows),
+        'employment_type': rng.choice(['FT', 'PT', 'CT', 'FL'], n_rows),
+        'company_location': rng.choice(countries, n_rows),
+        'company_size': rng.choice(['S', 'M', 'L'], n_rows),
+        'remote_ratio': rng.choice([0, 50, 100], n_rows),
+        'years_experience': rng.integers(0, 30, n_rows),
+        'base_salary': np.round(rng.lognormal(11, 0.5, n_rows), 2),
+        'adjusted_total_usd': np.round(rng.lognormal(11.2, 0.5, n_rows), 2),
+    }).to_csv(path, index=False)
+
+
+def _benchmark_load(file_path, chunksize, optimize):
+    # Runs in a fresh process so ru_maxrss reflects only this loading mode
+    import resource
+    import time
+    import tracemalloc
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = load_data(file_path=file_path, chunksize=chunksize, optimize_dtypes=optimize)
+    seconds = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": seconds,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1024 ** 2,
+        "traced_peak_mb": traced_peak / 1024 ** 2,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "rss_before_mb": rss_before,
+    }
+
+
+if __name__ == "__main__":
+    # Usage (from the repo root): python -m auto_eda_project.data_ingestion.data_loader [csv_path] [n_rows]
+    import sys
+    import tempfile
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Every step runs in its own spawned process: ru_maxrss is inherited from the parent,
+    # so the parent must never hold the dataset itself
+    spawn = multiprocessing.get_context("spawn")
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if csv_path is None:
+            n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+            csv_path = os.path.join(tmp_dir, "synthetic_salaries.csv")
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                pool.submit(_write_synthetic_salaries, csv_path, n_rows).result()
+            print(f"🧪 Wrote synthetic dataset: {n_rows:,} rows")
+
+        modes = {
+            "default": (None, False),
+            f"chunked+optimized ({DEFAULT_CHUNKSIZE:,} rows)": (DEFAULT_CHUNKSIZE, True),
+        }
+        results = {}
+        for label, (chunksize, optimize) in modes.items():
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                results[label] = pool.submit(_benchmark_load, csv_path, chunksize, optimize).result()
+
+    print("\n📊 Load benchmark")
+    for label, r in results.items():
+        print(f"  {label:<32} time={r['seconds']:.2f}s  frame={r['frame_mb']:.1f} MB  "
+              f"traced peak={r['traced_peak_mb']:.1f} MB  "
+              f"peak RSS={r['peak_rss_mb']:.1f} MB (+{r['peak_rss_mb'] - r['rss_before_mb']:.1f} MB)")
+    base, optimized = results.values()
+    print(f"✅ Peak RSS growth reduced by "
+          f"{1 - (optimized['peak_rss_mb'] - optimized['rss_before_mb']) / (base['peak_rss_mb'] - base['rss_before_mb']):.0%}, "
+          f"frame memory by {1 - optimized['frame_mb'] / base['frame_mb']:.0%}")
@@ -1,11 +1,51 @@
 # auto_eda_project/db/connect.py
 
+import os
+import threading
 from sqlalchemy import create_engine
 
+# ✅ Connection pool settings (one pool per process and credential set)
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+POOL_RECYCLE_S = 1800
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
 def get_engine(user='postgres', password='lithin', host='localhost', db='instilit'):
     """
     Returns SQLAlchemy engine for given credentials.
+
+    Engines are created once per process and reused, so repeated loads share a
+    connection pool instead of reconnecting. `pool_pre_ping` replaces connections
+    the server has dropped.
     """
-    DATABASE_URI = f"postgresql+psycopg2://{user}:{password}@{host}/{db}"
-    engine = create_engine(DATABASE_URI)
+    key = (user, password, host, db)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                DATABASE_URI = f"postgresql+psycopg2://{user}:{password}@{host}/{db}"
+                engine = create_engine(
+                    DATABASE_URI,
+                    pool_size=POOL_SIZE,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    pool_pre_ping=True,
+                    pool_recycle=POOL_RECYCLE_S,
+                )
+                _engines[key] = engine
     return engine
+
+
+def _reset_pools_after_fork():
+    # Forked workers (Airflow tasks, multiprocessing) must not reuse the parent's sockets
+    global _engines_lock
+    _engines_lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
@@ -1,15 +1,25 @@
 # auto_eda_project/db/ingest_data.py
 
+import csv
+import io
 import os
 import sys
+import time
 import pandas as pd
+from sqlalchemy import inspect
 
 # ✅ Add project root dynamically
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from auto_eda_project.db.db_connect import get_engine
 
-def ingest_csv_to_postgres(csv_path, table_name, schema='public'):
+BULK_CHUNK_ROWS = 100_000     # Rows per COPY / executemany round trip
+SCHEMA_SAMPLE_ROWS = 10_000   # Rows used to infer column types for new tables
+INGEST_MODES = ("replace", "append", "upsert")
+
+
+def ingest_csv_to_postgres(csv_path, table_name, schema='public', bulk=False, mode='replace',
+                           key_columns=None, chunksize=BULK_CHUNK_ROWS, engine=None):
     """
     Ingest a CSV file into a PostgreSQL table.
 
@@ -17,22 +27,31 @@ def ingest_csv_to_postgres(csv_path, table_name, schema='public'):
         csv_path (str): Path to CSV file.
         table_name (str): Destination table name.
         schema (str): Database schema to use (default: 'public').
+        bulk (bool): Stream the file with `bulk_ingest_csv` instead of pandas `to_sql`.
+        mode (str): Bulk mode: 'replace', 'append' or 'upsert'.
+        key_columns (list): Conflict key for mode='upsert'.
+        chunksize (int): Rows per bulk round trip.
+        engine: SQLAlchemy engine (default: `get_engine()`).
     """
     try:
         # Get DB engine
-        engine = get_engine()
+        engine = engine or get_engine()
 
-        # Load CSV
-        df = pd.read_csv(csv_path)
-        print(f"📦 Loaded CSV from {csv_path} with shape: {df.shape}")
+        if bulk:
+            bulk_ingest_csv(csv_path, table_name, schema=schema, mode=mode, key_columns=key_columns,
+                            chunksize=chunksize, engine=engine)
+        else:
+            # Load CSV
+            df = pd.read_csv(csv_path)
+            print(f"📦 Loaded CSV from {csv_path} with shape: {df.shape}")
 
-        # Ingest to PostgreSQL
-        df.to_sql(name=table_name, con=engine, schema=schema,
-                  if_exists='replace', index=False)
-        print(f"✅ Data written to PostgreSQL table: {schema}.{table_name}")
+            # Ingest to PostgreSQL
+            df.to_sql(name=table_name, con=engine, schema=schema,
+                      if_exists='replace', index=False)
+            print(f"✅ Data written to PostgreSQL table: {schema}.{table_name}")
 
         # Optional: Preview sample
-        preview_query = f"SELECT * FROM {schema}.{table_name} LIMIT 5"
+        preview_query = f"SELECT * FROM {_qualify(engine, table_name, schema)} LIMIT 5"
         preview_df = pd.read_sql(preview_query, con=engine)
         print("📄 Sample from ingested table:")
         print(preview_df)
@@ -40,10 +59,156 @@ def ingest_csv_to_postgres(csv_path, table_name, schema='public'):
     except Exception as e:
         print("❌ Error during ingestion:", str(e))
 
+
+def _qualify(engine, name, schema):
+    quote = engine.dialect.identifier_preparer.quote
+    if engine.dialect.name == 'sqlite' or not schema:
+        return quote(name)
+    return f"{quote(schema)}.{quote(name)}"
+
+
+def _iter_row_chunks(reader, chunksize):
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_rows(cursor, staging, column_sql, rows):
+    # PostgreSQL: one COPY ... FROM STDIN per chunk (empty unquoted fields load as NULL)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    sql = f"COPY {staging} ({column_sql}) FROM STDIN WITH (FORMAT csv)"
+    if hasattr(cursor, "copy_expert"):  # psycopg2
+        cursor.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _insert_rows(cursor, staging, column_sql, n_columns, rows):
+    # SQLite stand-in: executemany with NULL for empty fields, like COPY's csv format
+    placeholders = ", ".join(["?"] * n_columns)
+    cursor.executemany(
+        f"INSERT INTO {staging} ({column_sql}) VALUES ({placeholders})",
+        ([value if value != "" else None for value in row] for row in rows),
+    )
+
+
+def bulk_ingest_csv(csv_path, table_name, schema='public', mode='replace', key_columns=None,
+                    chunksize=BULK_CHUNK_ROWS, engine=None):
+    """
+    Streams a CSV into a database table in bounded chunks, never holding the full file.
+
+    Rows are first loaded into `<table_name>_staging` (COPY FROM STDIN on PostgreSQL,
+    executemany on SQLite), then merged in the same transaction:
+        - replace: the staging table is renamed over the target (readers never see a half-loaded table)
+        - append:  INSERT INTO target SELECT * FROM staging
+        - upsert:  INSERT ... ON CONFLICT (key_columns) DO UPDATE, last row per key wins
+
+    Column types for new tables are inferred from the first SCHEMA_SAMPLE_ROWS rows.
+
+    Args:
+        csv_path (str): Path to CSV file.
+        table_name (str): Destination table name.
+        schema (str): Database schema to use (ignored on SQLite).
+        mode (str): 'replace', 'append' or 'upsert'.
+        key_columns (list): Conflict key for mode='upsert'.
+        chunksize (int): Rows per round trip.
+        engine: SQLAlchemy engine (default: `get_engine()`).
+
+    Returns:
+        dict: rows, seconds and rows_per_sec of the load.
+    """
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode}. Expected one of {INGEST_MODES}")
+    if mode == 'upsert' and not key_columns:
+        raise ValueError("key_columns must be given for mode='upsert'.")
+
+    engine = engine or get_engine()
+    is_postgres = engine.dialect.name == 'postgresql'
+    db_schema = schema if engine.dialect.name != 'sqlite' else None
+    quote = engine.dialect.identifier_preparer.quote
+
+    staging_name = f"{table_name}_staging"
+    target = _qualify(engine, table_name, schema)
+    staging = _qualify(engine, staging_name, schema)
+    target_exists = inspect(engine).has_table(table_name, schema=db_schema)
+
+    sample = pd.read_csv(csv_path, nrows=SCHEMA_SAMPLE_ROWS)
+    columns = list(sample.columns)
+    column_sql = ", ".join(quote(col) for col in columns)
+
+    start = time.perf_counter()
+    n_rows = 0
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(pd.io.sql.get_schema(sample.head(0), staging_name, con=engine, schema=db_schema))
+
+        # 🔹 Stream the file into staging
+        with open(csv_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            if header != columns:
+                raise ValueError(f"Unexpected CSV header: {header}")
+            for rows in _iter_row_chunks(reader, chunksize):
+                if is_postgres:
+                    _copy_rows(cursor, staging, column_sql, rows)
+                else:
+                    _insert_rows(cursor, staging, column_sql, len(columns), rows)
+                n_rows += len(rows)
+                print(f"📥 Staged {n_rows:,} rows")
+
+        # 🔹 Merge staging into the target
+        if mode == 'replace':
+            cursor.execute(f"DROP TABLE IF EXISTS {target}")
+            cursor.execute(f"ALTER TABLE {staging} RENAME TO {quote(table_name)}")
+        else:
+            if not target_exists:
+                cursor.execute(pd.io.sql.get_schema(sample.head(0), table_name, con=engine, schema=db_schema))
+            if mode == 'append':
+                cursor.execute(f"INSERT INTO {target} ({column_sql}) SELECT {column_sql} FROM {staging}")
+            else:
+                key_sql = ", ".join(quote(col) for col in key_columns)
+                index_name = quote(f"{table_name}_{'_'.join(key_columns)}_key")
+                cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {target} ({key_sql})")
+                updates = ", ".join(f"{quote(col)} = EXCLUDED.{quote(col)}" for col in columns
+                                    if col not in key_columns)
+                on_conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+                # One row per key (the last one staged), or ON CONFLICT would hit a row twice
+                if is_postgres:
+                    latest = (f"SELECT DISTINCT ON ({key_sql}) {column_sql} FROM {staging} "
+                              f"ORDER BY {key_sql}, ctid DESC")
+                else:
+                    latest = (f"SELECT {column_sql} FROM {staging} WHERE rowid IN "
+                              f"(SELECT MAX(rowid) FROM {staging} GROUP BY {key_sql})")
+                cursor.execute(f"INSERT INTO {target} ({column_sql}) {latest} "
+                               f"ON CONFLICT ({key_sql}) {on_conflict}")
+            cursor.execute(f"DROP TABLE {staging}")
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    seconds = time.perf_counter() - start
+    rows_per_sec = n_rows / seconds if seconds else float('inf')
+    print(f"✅ Bulk {mode} of {n_rows:,} rows into {target} in {seconds:.2f}s ({rows_per_sec:,.0f} rows/sec)")
+    return {"rows": n_rows, "seconds": seconds, "rows_per_sec": rows_per_sec}
+
 # --------------------------------------------
 # ✅ Add this to make the script executable
 # --------------------------------------------
 if __name__ == "__main__":
     csv_path = os.path.join("auto_eda_project", "Data", "Software_Salaries.csv")
     table_name = "software_salaries"
-    ingest_csv_to_postgres(csv_path=csv_path, table_name=table_name)
+    ingest_csv_to_postgres(csv_path=csv_path, table_name=table_name, bulk=True)
@@ -1,15 +1,31 @@
 import os
 import pandas as pd
-from ydata_profiling import ProfileReport
 
-def run_autoeda(df: pd.DataFrame, output_path: str, report_name="autoeda_report.html"):
+from eda.fast_profile import profile_dataframe, save_profile
+
+def run_autoeda(df: pd.DataFrame, output_path: str, report_name="autoeda_report.html", full=False,
+                sample_size=100_000):
     """
-    Generates an EDA report using ydata-profiling and saves it as an HTML file.
+    Generates an EDA report and saves it as an HTML file.
+
+    By default a fast vectorized profile (missing rates, cardinality, quantiles,
+    skew, top-k values, sampled correlations) is written as HTML plus JSON.
+    `full=True` builds the complete ydata-profiling report instead, which is much
+    slower and memory-hungry on large tables.
     """
     os.makedirs(output_path, exist_ok=True)
     output_file = os.path.join(output_path, report_name)
 
-    profile = ProfileReport(df, title="Auto EDA Report", explorative=True)
-    profile.to_file(output_file)
+    if full:
+        from ydata_profiling import ProfileReport  # Heavy import, only needed for the full report
+
+        profile = ProfileReport(df, title="Auto EDA Report", explorative=True)
+        profile.to_file(output_file)
+        print(f"AutoEDA report saved at: {output_file}")
+        return
 
-    print(f"AutoEDA report saved at: {output_file}")
+    profile = profile_dataframe(df, sample_size=sample_size)
+    html_path, json_path = save_profile(profile, output_path, report_name)
+    print(f"⚡ Fast AutoEDA profile ({profile['overview']['profile_seconds']:.2f}s) saved at: {html_path} (+ {json_path})")
+    for alert in profile["alerts"]:
+        print(f"   ⚠️ {alert}")
@@ -5,59 +5,69 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from eda.parallel_plots import render_plots
+
 sns.set(style="whitegrid")
 
 # 📊 Univariate Plots
-def plot_univariate(df: pd.DataFrame, output_dir: str = "eda_output/plots/univariate"):
+def _render_univariate(series: pd.Series, output_dir: str):
+    col = series.name
+    plt.figure(figsize=(8, 4))
+    if not pd.api.types.is_numeric_dtype(series):
+        sns.countplot(x=series)
+    else:
+        sns.histplot(series.dropna(), kde=True, bins=30)
+    plt.title(f'Univariate Distribution: {col}')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(f"{output_dir}/{col}_univariate.png")
+    plt.close()
+
+def plot_univariate(df: pd.DataFrame, output_dir: str = "eda_output/plots/univariate", n_jobs: int = 1):
     os.makedirs(output_dir, exist_ok=True)
-    for col in df.select_dtypes(include=['number', 'object', 'category']):
-        plt.figure(figsize=(8, 4))
-        if df[col].dtype == 'object' or df[col].dtype.name == 'category':
-            sns.countplot(x=col, data=df)
-        else:
-            sns.histplot(df[col].dropna(), kde=True, bins=30)
-        plt.title(f'Univariate Distribution: {col}')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/{col}_univariate.png")
-        plt.close()
+    tasks = [(f"{col}_univariate", _render_univariate, (df[col], output_dir))
+             for col in df.select_dtypes(include=['number', 'object', 'category'])]
+    return render_plots(tasks, n_jobs=n_jobs, title="Univariate plots")
 
 # 🔗 Bivariate with Target
-def plot_bivariate(df: pd.DataFrame, target: str, output_dir: str = "eda_output/plots/bivariate"):
+def _render_bivariate(data: pd.DataFrame, col: str, target: str, output_dir: str):
+    plt.figure(figsize=(8, 4))
+    if not pd.api.types.is_numeric_dtype(data[col]):
+        sns.boxplot(x=col, y=target, data=data)
+    else:
+        sns.scatterplot(x=col, y=target, data=data)
+    plt.title(f'Bivariate: {col} vs {target}')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(f"{output_dir}/{col}_vs_{target}.png")
+    plt.close()
+
+def plot_bivariate(df: pd.DataFrame, target: str, output_dir: str = "eda_output/plots/bivariate", n_jobs: int = 1):
     os.makedirs(output_dir, exist_ok=True)
-    for col in df.select_dtypes(include=['number', 'object']):
-        if col == target:
-            continue
-        plt.figure(figsize=(8, 4))
-        if df[col].dtype == 'object':
-            sns.boxplot(x=col, y=target, data=df)
-        else:
-            sns.scatterplot(x=col, y=target, data=df)
-        plt.title(f'Bivariate: {col} vs {target}')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/{col}_vs_{target}.png")
-        plt.close()
+    tasks = [(f"{col}_vs_{target}", _render_bivariate, (df[[col, target]], col, target, output_dir))
+             for col in df.select_dtypes(include=['number', 'object']) if col != target]
+    return render_plots(tasks, n_jobs=n_jobs, title="Bivariate plots")
 
 # 📦 Boxplots for Numerical Features
-def plot_boxplots(df: pd.DataFrame, output_dir: str = "eda_output/plots/boxplots"):
-    import seaborn as sns
-    import matplotlib.pyplot as plt
-    import os
+def _render_boxplot(values: pd.Series, output_dir: str):
+    col = values.name
+    plt.figure(figsize=(8, 1.5))
+    try:
+        sns.boxplot(x=values)
+        plt.title(f'Boxplot: {col}')
+        plt.tight_layout()
+        plt.savefig(f"{output_dir}/{col}_boxplot.png")
+    finally:
+        plt.close()
 
+def plot_boxplots(df: pd.DataFrame, output_dir: str = "eda_output/plots/boxplots", n_jobs: int = 1):
     os.makedirs(output_dir, exist_ok=True)
 
+    tasks = []
     for col in df.select_dtypes(include=['number']):
-        if df[col].dropna().empty:
+        values = df[col].dropna()
+        if values.empty:
             print(f"⚠️ Skipping '{col}' - empty or invalid for boxplot.")
             continue
-        plt.figure(figsize=(8, 1.5))
-        try:
-            sns.boxplot(x=df[col].dropna())
-            plt.title(f'Boxplot: {col}')
-            plt.tight_layout()
-            plt.savefig(f"{output_dir}/{col}_boxplot.png")
-            plt.close()
-        except Exception as e:
-            print(f"❌ Skipping '{col}' due to error: {e}")
-
+        tasks.append((f"{col}_boxplot", _render_boxplot, (values, output_dir)))
+    return render_plots(tasks, n_jobs=n_jobs, title="Boxplots")
@@ -0,0 +1,202 @@
+import html
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Fast, vectorized alternative to the full ydata-profiling report. Per-column
+# statistics are computed on the full frame in column-wise passes; correlations
+# (the quadratic part) use a row sample.
+
+PROFILE_QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+HIGH_MISSING_RATE = 0.2
+HIGH_CARDINALITY_RATIO = 0.5
+HIGH_SKEW = 1.0
+HIGH_CORRELATION = 0.9
+
+
+def _clean(value):
+    # JSON-safe scalars (numpy types -> Python, NaN/inf -> None)
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if not math.isfinite(value) else round(float(value), 6)
+    if isinstance(value, (np.bool_,)):
+        return bool(value)
+    if isinstance(value, (pd.Timestamp,)):
+        return value.isoformat()
+    return value
+
+
+def profile_dataframe(df: pd.DataFrame, sample_size: int = 100_000, top_k: int = 10,
+                      random_state: int = 42) -> dict:
+    """
+    Computes a compact profile: overview, per-column missing rates, cardinality,
+    quantiles, skew, top-k values, correlations and alerts.
+
+    Parameters:
+        df (pd.DataFrame): Data to profile
+        sample_size (int): Rows sampled for correlations
+        top_k (int): Most frequent values kept per categorical column
+        random_state (int): Seed of the correlation sample
+
+    Returns:
+        dict: JSON-serializable profile
+    """
+    start = time.perf_counter()
+    n_rows = len(df)
+    num_cols = df.select_dtypes(include='number').columns.tolist()
+    other_cols = [col for col in df.columns if col not in num_cols]
+
+    # 🔹 Column-wise passes over the full frame
+    missing = df.isna().sum()
+    distinct = df.nunique(dropna=True)
+    row_hashes = pd.util.hash_pandas_object(df, index=False)
+
+    columns = {}
+    if num_cols:
+        numeric = df[num_cols]
+        quantiles = numeric.quantile(PROFILE_QUANTILES)
+        summary = {
+            "mean": numeric.mean(), "std": numeric.std(), "min": numeric.min(), "max": numeric.max(),
+            "skew": numeric.skew(), "kurtosis": numeric.kurt(), "zeros": (numeric == 0).sum(),
+        }
+        for col in num_cols:
+            stats = {name: _clean(values[col]) for name, values in summary.items()}
+            stats["quantiles"] = {f"p{int(q * 100)}": _clean(quantiles.at[q, col]) for q in PROFILE_QUANTILES}
+            columns[col] = {"kind": "numeric", **stats}
+
+    for col in other_cols:
+        counts = df[col].value_counts(dropna=True)
+        columns[col] = {
+            "kind": "categorical",
+            "top_values": {str(k): int(v) for k, v in counts.head(top_k).items()},
+        }
+
+    for col in df.columns:
+        columns[col].update({
+            "dtype": str(df[col].dtype),
+            "missing": int(missing[col]),
+            "missing_rate": _clean(missing[col] / n_rows if n_rows else 0.0),
+            "distinct": int(distinct[col]),
+            "distinct_ratio": _clean(distinct[col] / n_rows if n_rows else 0.0),
+        })
+
+    # 🔹 Correlations on a sample (quadratic in columns, so kept off the full frame)
+    correlations = {}
+    if len(num_cols) > 1:
+        sample = df[num_cols]
+        if n_rows > sample_size:
+            sample = sample.sample(sample_size, random_state=random_state)
+        for method in ("pearson", "spearman"):
+            corr = sample.corr(method=method)
+            correlations[method] = {a: {b: _clean(corr.at[a, b]) for b in num_cols} for a in num_cols}
+
+    # 🔹 Alerts
+    alerts = []
+    for col, stats in columns.items():
+        if stats["missing_rate"] and stats["missing_rate"] > HIGH_MISSING_RATE:
+            alerts.append(f"{col}: {stats['missing_rate']:.1%} missing")
+        if stats["distinct"] <= 1:
+            alerts.append(f"{col}: constant")
+        if stats["kind"] == "categorical" and stats["distinct_ratio"] > HIGH_CARDINALITY_RATIO:
+            alerts.append(f"{col}: high cardinality ({stats['distinct']} distinct)")
+        if stats["kind"] == "numeric" and stats["skew"] is not None and abs(stats["skew"]) > HIGH_SKEW:
+            alerts.append(f"{col}: skewed (skew={stats['skew']:.2f})")
+    pearson = correlations.get("pearson", {})
+    for i, a in enumerate(num_cols):
+        for b in num_cols[i + 1:]:
+            r = pearson.get(a, {}).get(b)
+            if r is not None and abs(r) > HIGH_CORRELATION:
+                alerts.append(f"{a} ~ {b}: highly correlated (r={r:.2f})")
+
+    return {
+        "overview": {
+            "rows": n_rows,
+            "columns": df.shape[1],
+            "numeric_columns": len(num_cols),
+            "memory_mb": _clean(df.memory_usage(deep=True).sum() / 1024 ** 2),
+            "missing_cells": int(missing.sum()),
+            "duplicate_rows": int(row_hashes.duplicated().sum()),
+            "correlation_sample_rows": min(n_rows, sample_size),
+            "profile_seconds": _clean(time.perf_counter() - start),
+        },
+        "columns": columns,
+        "correlations": correlations,
+        "alerts": alerts,
+    }
+
+
+def _table(rows, headers):
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape('' if v is None else str(v))}</td>" for v in row) + "</tr>"
+        for row in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def render_profile_html(profile: dict, title: str = "Auto EDA Report") -> str:
+    """
+    Renders the profile as a single self-contained HTML page.
+    """
+    overview = _table(profile["overview"].items(), ["metric", "value"])
+    alerts = "".join(f"<li>{html.escape(a)}</li>" for a in profile["alerts"]) or "<li>None</li>"
+
+    numeric_rows, categorical_rows = [], []
+    for col, s in profile["columns"].items():
+        common = [col, s["dtype"], s["missing"], s["missing_rate"], s["distinct"]]
+        if s["kind"] == "numeric":
+            q = s["quantiles"]
+            numeric_rows.append(common + [s["mean"], s["std"], s["min"], q["p5"], q["p50"], q["p95"],
+                                          s["max"], s["skew"], s["zeros"]])
+        else:
+            top = ", ".join(f"{k} ({v})" for k, v in s["top_values"].items())
+            categorical_rows.append(common + [top])
+
+    numeric = _table(numeric_rows, ["column", "dtype", "missing", "missing rate", "distinct", "mean", "std",
+                                    "min", "p5", "p50", "p95", "max", "skew", "zeros"])
+    categorical = _table(categorical_rows, ["column", "dtype", "missing", "missing rate", "distinct", "top values"])
+
+    corr_html = ""
+    for method, matrix in profile["correlations"].items():
+        cols = list(matrix)
+        corr_html += f"<h3>{method.title()}</h3>" + _table(
+            [[a] + [matrix[a][b] for b in cols] for a in cols], [""] + cols)
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5em; font-size: 13px; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: right; }}
+th {{ background: #f0f0f0; }}
+</style></head><body>
+<h1>{html.escape(title)}</h1>
+<h2>Overview</h2>{overview}
+<h2>Alerts</h2><ul>{alerts}</ul>
+<h2>Numeric columns</h2>{numeric}
+<h2>Categorical columns</h2>{categorical}
+<h2>Correlations (sampled)</h2>{corr_html or "<p>Not enough numeric columns.</p>"}
+</body></html>"""
+
+
+def save_profile(profile: dict, output_path: str, report_name: str = "autoeda_report.html",
+                 title: str = "Auto EDA Report"):
+    """
+    Writes the profile as HTML (report_name) and JSON (same name, .json).
+
+    Returns:
+        tuple: (html_path, json_path)
+    """
+    os.makedirs(output_path, exist_ok=True)
+    html_path = os.path.join(output_path, report_name)
+    json_path = os.path.splitext(html_path)[0] + ".json"
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(render_profile_html(profile, title=title))
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    return html_path, json_path
@@ -0,0 +1,150 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from eda.parallel_plots import render_plots
+
+# Skewness and outlier statistics for all numeric columns in one vectorized pass.
+# The result table drives both the console report and which columns get plotted.
+
+
+def compute_numeric_stats(df: pd.DataFrame, skew_threshold: float = 1.0, iqr_factor: float = 1.5,
+                          z_thresh: float = 3.0, skip_binary: bool = False) -> pd.DataFrame:
+    """
+    Computes skew, IQR bounds and outlier counts for every numeric column at once.
+
+    Parameters:
+        df (pd.DataFrame): Data (non-numeric columns are ignored)
+        skew_threshold (float): |skew| above which a column is flagged as skewed
+        iqr_factor (float): Bounds are Q1 - k*IQR and Q3 + k*IQR
+        z_thresh (float): |z-score| above which a value is an outlier
+        skip_binary (bool): Never flag columns with two or fewer distinct values
+
+    Returns:
+        pd.DataFrame: One row per numeric column with count, mean, std, skew, q1, q3,
+        iqr, lower, upper, iqr_outliers, z_outliers and the boolean flags binary,
+        skewed, iqr_flagged and z_flagged.
+    """
+    numeric = df.select_dtypes(include='number')
+    X = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # One quantile call for all columns (same linear interpolation as Series.quantile)
+    q1, q3 = numeric.quantile([0.25, 0.75]).to_numpy(dtype=np.float64)
+    iqr = q3 - q1
+    lower, upper = q1 - iqr_factor * iqr, q3 + iqr_factor * iqr
+    mean = numeric.mean().to_numpy()
+    std = numeric.std().to_numpy()
+
+    # Broadcast the per-column bounds over the rows (NaNs compare False, as before)
+    with np.errstate(invalid="ignore"):
+        iqr_outliers = ((X < lower) | (X > upper)).sum(axis=0)
+        z_outliers = (np.abs(X - mean) > z_thresh * std).sum(axis=0)
+        # Two or fewer distinct values <=> every value is the column min or max
+        col_min, col_max = numeric.min().to_numpy(), numeric.max().to_numpy()
+        binary = ((X == col_min) | (X == col_max) | np.isnan(X)).all(axis=0)
+
+    stats = pd.DataFrame({
+        "count": numeric.count().to_numpy(),
+        "mean": mean,
+        "std": std,
+        "skew": numeric.skew().to_numpy(),
+        "q1": q1,
+        "q3": q3,
+        "iqr": iqr,
+        "lower": lower,
+        "upper": upper,
+        "iqr_outliers": iqr_outliers,
+        "z_outliers": z_outliers,
+    }, index=numeric.columns)
+
+    stats["binary"] = binary
+    eligible = ~stats["binary"] if skip_binary else pd.Series(True, index=stats.index)
+    stats["skewed"] = eligible & (stats["skew"].abs() > skew_threshold)
+    stats["iqr_flagged"] = eligible & (stats["iqr_outliers"] > 0)
+    stats["z_flagged"] = eligible & (stats["z_outliers"] > 0)
+    return stats
+
+
+# ---------------------------- Plots (flagged columns only) ----------------------------
+
+def _render_skew_plot(series: pd.Series, skew: float, save_dir: str):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    col = series.name
+    plt.figure(figsize=(6, 4))
+    sns.histplot(series, kde=True, bins=30, color="orange")
+    plt.title(f"Skewed Feature: {col}\nSkewness = {skew:.2f}")
+    plt.tight_layout()
+    plt.savefig(f"{save_dir}/{col}_skew.png")
+    plt.close()
+
+
+def _render_outlier_plot(series: pd.Series, save_dir: str):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    col = series.name
+    plt.figure(figsize=(6, 4))
+    sns.boxplot(x=series, color="salmon")
+    plt.title(f"Outliers in {col}")
+    plt.tight_layout()
+    plt.savefig(f"{save_dir}/{col}_outliers.png")
+    plt.close()
+
+
+def analyze_skewness(df: pd.DataFrame, threshold: float = 1.0, save_dir: str = None, stats: pd.DataFrame = None,
+                     skip_binary: bool = False, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    Prints the skewed numeric features and, with `save_dir`, plots only those.
+
+    Returns:
+        pd.DataFrame: The stats table (pass it back in to reuse it)
+    """
+    if stats is None:
+        stats = compute_numeric_stats(df, skew_threshold=threshold, skip_binary=skip_binary)
+    flagged = stats[stats["skewed"]]
+
+    print("\n📈 Skewness Analysis:")
+    for col, row in flagged.iterrows():
+        print(f"⚠️ Skewed Feature: {col} | Skewness: {row['skew']:.2f}")
+
+    if save_dir and not flagged.empty:
+        os.makedirs(save_dir, exist_ok=True)
+        tasks = [(f"{col}_skew", _render_skew_plot, (df[col], row["skew"], save_dir))
+                 for col, row in flagged.iterrows()]
+        render_plots(tasks, n_jobs=n_jobs, title="Skewness plots")
+    return stats
+
+
+def analyze_outliers(df: pd.DataFrame, method: str = "zscore", threshold: float = None, save_dir: str = None,
+                     stats: pd.DataFrame = None, skip_binary: bool = False, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    Prints outlier counts per numeric feature (z-score or IQR rule) and, with
+    `save_dir`, draws boxplots for the flagged features only.
+
+    Parameters:
+        method (str): "zscore" (default threshold 3.0) or "iqr" (default factor 1.5)
+
+    Returns:
+        pd.DataFrame: The stats table
+    """
+    if method not in ("zscore", "iqr"):
+        raise ValueError(f"Unknown outlier method: {method}. Expected 'zscore' or 'iqr'")
+    if stats is None:
+        kwargs = {"z_thresh": threshold} if method == "zscore" else {"iqr_factor": threshold}
+        stats = compute_numeric_stats(df, skip_binary=skip_binary,
+                                      **{k: v for k, v in kwargs.items() if v is not None})
+    flag, count = ("z_flagged", "z_outliers") if method == "zscore" else ("iqr_flagged", "iqr_outliers")
+    flagged = stats[stats[flag]]
+
+    print("\n📦 Outlier Analysis:")
+    for col, row in flagged.iterrows():
+        print(f"⚠️ Outliers detected in {col}: {int(row[count])} rows")
+
+    if save_dir and not flagged.empty:
+        os.makedirs(save_dir, exist_ok=True)
+        tasks = [(f"{col}_outliers", _render_outlier_plot, (df[col], save_dir)) for col in flagged.index]
+        render_plots(tasks, n_jobs=n_jobs, title="Outlier plots")
+    return stats
@@ -0,0 +1,89 @@
+import atexit
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Renders per-column EDA figures in worker processes with the headless Agg backend.
+# A task is (label, render_fn, args); render_fn must be a module-level function.
+
+_pools = {}
+
+
+def resolve_n_jobs(n_jobs) -> int:
+    """
+    Maps n_jobs to a worker count (-1 / None = all cores).
+    """
+    cores = os.cpu_count() or 1
+    if n_jobs is None or n_jobs < 0:
+        return cores
+    return max(1, min(n_jobs, cores))
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def _get_pool(n_workers):
+    # Pools are reused across plot groups so the seaborn/matplotlib import cost is paid once
+    pool = _pools.get(n_workers)
+    if pool is None:
+        os.environ.setdefault("MPLBACKEND", "Agg")  # Inherited by the spawned workers
+        pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker)
+        _pools[n_workers] = pool
+    return pool
+
+
+@atexit.register
+def shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=True)
+    _pools.clear()
+
+
+def _timed_render(label, render_fn, args):
+    start = time.perf_counter()
+    error = None
+    try:
+        render_fn(*args)
+    except Exception as e:
+        error = str(e)
+    return {"plot": label, "seconds": time.perf_counter() - start, "error": error}
+
+
+def render_plots(tasks, n_jobs=1, title="EDA plots"):
+    """
+    Renders plot tasks sequentially (n_jobs=1) or across a process pool, and
+    prints per-plot timings.
+
+    Parameters:
+        tasks (list): (label, render_fn, args) tuples, one per figure
+        n_jobs (int): Worker processes (-1 = all cores)
+        title (str): Name used in the timing report
+
+    Returns:
+        list: One {"plot", "seconds", "error"} dict per task
+    """
+    tasks = list(tasks)
+    n_workers = min(resolve_n_jobs(n_jobs), max(len(tasks), 1))
+    start = time.perf_counter()
+
+    if n_workers == 1:
+        timings = [_timed_render(*task) for task in tasks]
+    else:
+        pool = _get_pool(n_workers)
+        timings = list(pool.map(_timed_render, *zip(*tasks))) if tasks else []
+
+    wall = time.perf_counter() - start
+    for timing in timings:
+        if timing["error"]:
+            print(f"❌ Skipping '{timing['plot']}' due to error: {timing['error']}")
+
+    busy = sum(t["seconds"] for t in timings)
+    print(f"⏱️ {title}: {len(timings)} figures in {wall:.2f}s on {n_workers} worker(s) "
+          f"(plot time {busy:.2f}s, speedup x{busy / wall if wall else 0:.1f})")
+    for timing in sorted(timings, key=lambda t: t["seconds"], reverse=True)[:5]:
+        print(f"   {timing['plot']:<40} {timing['seconds']:.2f}s")
+    return timings
@@ -3,37 +3,48 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from eda.parallel_plots import render_plots
+
 sns.set(style="whitegrid")
 
+
+def _safe_name(col: str) -> str:
+    return col.replace('/', '_').replace(' ', '_').replace('|', '_')
+
+
 # 📊 Univariate Plots for Processed Data
-def plot_processed_univariate(df: pd.DataFrame, output_dir: str = "eda_output/processed_eda/univariate"):
+def _render_processed_univariate(series: pd.Series, output_dir: str):
+    col = series.name
+    plt.figure(figsize=(8, 4))
+    sns.histplot(series, kde=True, bins=30)
+    plt.title(f'Processed Univariate: {col}')
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, f"{_safe_name(col)}_univariate.png"))
+    plt.close()
+
+def plot_processed_univariate(df: pd.DataFrame, output_dir: str = "eda_output/processed_eda/univariate",
+                              n_jobs: int = 1):
     os.makedirs(output_dir, exist_ok=True)
-    for col in df.select_dtypes(include='number').columns:
-        if df[col].dropna().empty:
-            continue
-        plt.figure(figsize=(8, 4))
-        sns.histplot(df[col], kde=True, bins=30)
-        plt.title(f'Processed Univariate: {col}')
-        plt.tight_layout()
-        safe_col = col.replace('/', '_').replace(' ', '_').replace('|', '_')
-        plt.savefig(os.path.join(output_dir, f"{safe_col}_univariate.png"))
-        plt.close()
+    tasks = [(f"{col}_univariate", _render_processed_univariate, (df[col], output_dir))
+             for col in df.select_dtypes(include='number').columns if not df[col].dropna().empty]
+    return render_plots(tasks, n_jobs=n_jobs, title="Processed univariate plots")
 
 
 # 📦 Boxplots for Processed Numerical Features
-def plot_processed_boxplots(df: pd.DataFrame, output_dir: str = "eda_output/processed_eda/boxplots"):
-    os.makedirs(output_dir, exist_ok=True)
+def _render_processed_boxplot(series: pd.Series, output_dir: str):
+    col = series.name
+    plt.figure(figsize=(8, 1.5))
+    try:
+        sns.boxplot(x=series)
+        plt.title(f'Processed Boxplot: {col}')
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, f"{_safe_name(col)}_boxplot.png"))
+    finally:
+        plt.close()
 
-    for col in df.select_dtypes(include='number').columns:
-        if df[col].dropna().empty:
-            continue
-        plt.figure(figsize=(8, 1.5))
-        try:
-            sns.boxplot(x=df[col])
-            plt.title(f'Processed Boxplot: {col}')
-            plt.tight_layout()
-            safe_col = col.replace('/', '_').replace(' ', '_').replace('|', '_')
-            plt.savefig(os.path.join(output_dir, f"{safe_col}_boxplot.png"))
-            plt.close()
-        except Exception as e:
-            print(f"❌ Skipping '{col}' due to error: {e}")
+def plot_processed_boxplots(df: pd.DataFrame, output_dir: str = "eda_output/processed_eda/boxplots",
+                            n_jobs: int = 1):
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(f"{col}_boxplot", _render_processed_boxplot, (df[col], output_dir))
+             for col in df.select_dtypes(include='number').columns if not df[col].dropna().empty]
+    return render_plots(tasks, n_jobs=n_jobs, title="Processed boxplots")
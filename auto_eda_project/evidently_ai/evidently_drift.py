@@ -2,17 +2,68 @@ import os
 import sys
 import pandas as pd
 import mlflow
-from evidently.report import Report
-from evidently.metric_preset import TargetDriftPreset, DataDriftPreset, DataQualityPreset
 from sklearn.model_selection import train_test_split
 from functools import reduce
 
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "../.."))
 from auto_eda_project.evidently_ai.log_drift_metrics import log_evidently_metrics
+from auto_eda_project.mlflow.buffered_logger import get_logger
+from auto_eda_project.evidently_ai.reference_profile import (
+    build_reference_profile, load_reference_profile, reference_profile_path, score_drift, as_report_dict
+)
 
+MODEL_SAVE_PATH = "auto_eda_project/save_model/best_capstone_model.pkl"
 
-def run_evidently_drift():
+
+def check_drift(current: pd.DataFrame, profile_path: str = None, log_to_mlflow: bool = False,
+                prefix: str = "batch__") -> dict:
+    """
+    Scores a new batch against the reference profile saved with the model.
+    Cost is O(len(current)): the reference data is never reloaded.
+
+    Parameters:
+        current (pd.DataFrame): New batch (raw feature columns, target optional)
+        profile_path (str): Profile JSON (default: next to the saved model)
+        log_to_mlflow (bool): Log the drift metrics in a "Drift_Batch" run
+        prefix (str): Prefix for the logged metric names
+
+    Returns:
+        dict: Output of `score_drift` (see "drift_detected")
+    """
+    profile = load_reference_profile(profile_path or reference_profile_path(MODEL_SAVE_PATH))
+    drift = score_drift(profile, current)
+    print(f"🌊 Drift check: {drift['number_of_drifted_columns']}/{drift['number_of_columns']} columns drifted "
+          f"on {drift['n_rows']} rows ({drift['score_seconds'] * 1000:.1f} ms) -> "
+          f"{'DRIFT' if drift['drift_detected'] else 'no drift'}")
+
+    if log_to_mlflow:
+        mlflow.set_experiment("Data Drift Monitoring")
+        with get_logger().run(run_name="Drift_Batch"):
+            log_evidently_metrics(as_report_dict(drift), prefix=prefix)
+    return drift
+
+
+def _evidently_report(reference, current, html_path, prefix):
+    # Full Evidently report: recomputes every reference-side statistic, so only used for HTML output
+    from evidently.report import Report
+    from evidently.metric_preset import TargetDriftPreset, DataDriftPreset, DataQualityPreset
+
+    report = Report(metrics=[TargetDriftPreset(), DataDriftPreset(), DataQualityPreset()])
+    report.run(reference_data=reference, current_data=current)
+    report.save_html(html_path)
+    mlflow.log_artifact(html_path)
+    log_evidently_metrics(report.as_dict(), prefix=prefix)
+
+
+def run_evidently_drift(html_reports: bool = False):
+    """
+    Train vs validation and validation vs test drift, logged to MLflow.
+
+    By default each reference split is profiled once and the other split is scored
+    against the profile. `html_reports=True` runs the full Evidently presets
+    instead and saves their HTML reports.
+    """
     mlflow.set_experiment("Data Drift Monitoring")
 
     # Load historical data
@@ -41,35 +92,31 @@ def run_evidently_drift():
         X_val.drop(columns=empty_cols_in_any_split, inplace=True)
         X_test.drop(columns=empty_cols_in_any_split, inplace=True)
 
-    # ------------------ 1️⃣ Train vs Validation ------------------
-    with mlflow.start_run(run_name="Drift_Train_vs_Validation"):
-        train_df = X_train.copy()
-        train_df["target"] = y_train
-        val_df = X_val.copy()
-        val_df["target"] = y_val
-
-        report = Report(metrics=[TargetDriftPreset(), DataDriftPreset(), DataQualityPreset()])
-        report.run(reference_data=train_df, current_data=val_df)
-        report.save_html("auto_eda_project/drift_reports/train_vs_validation_drift.html")
-        mlflow.log_artifact("train_vs_validation_drift.html")
-
-        results = report.as_dict()
-        log_evidently_metrics(results, prefix="train_val__")
-
-    # ------------------ 2️⃣ Validation vs Test ------------------
-    with mlflow.start_run(run_name="Drift_Validation_vs_Test"):
-        val_df = X_val.copy()
-        val_df["target"] = y_val
-        test_df = X_test.copy()
-        test_df["target"] = y_test
-
-        report = Report(metrics=[TargetDriftPreset(), DataDriftPreset(), DataQualityPreset()])
-        report.run(reference_data=val_df, current_data=test_df)
-        report.save_html("auto_eda_project/drift_reports/validation_vs_test_drift.html")
-        mlflow.log_artifact("validation_vs_test_drift.html")
-
-        results = report.as_dict()
-        log_evidently_metrics(results, prefix="val_test__")
+    train_df = X_train.copy()
+    train_df["target"] = y_train
+    val_df = X_val.copy()
+    val_df["target"] = y_val
+    test_df = X_test.copy()
+    test_df["target"] = y_test
+
+    comparisons = [
+        ("Drift_Train_vs_Validation", train_df, val_df, "train_vs_validation_drift.html", "train_val__"),
+        ("Drift_Validation_vs_Test", val_df, test_df, "validation_vs_test_drift.html", "val_test__"),
+    ]
+
+    # ------------------ 1️⃣ Train vs Validation, 2️⃣ Validation vs Test ------------------
+    for run_name, reference, current, html_name, prefix in comparisons:
+        with get_logger().run(run_name=run_name):
+            if html_reports:
+                os.makedirs("auto_eda_project/drift_reports", exist_ok=True)
+                _evidently_report(reference, current, os.path.join("auto_eda_project/drift_reports", html_name),
+                                  prefix)
+                continue
+
+            drift = score_drift(build_reference_profile(reference), current)
+            log_evidently_metrics(as_report_dict(drift), prefix=prefix)
+            print(f"🌊 {run_name}: {drift['number_of_drifted_columns']}/{drift['number_of_columns']} "
+                  f"columns drifted (dataset drift: {drift['drift_detected']})")
 
     # ------------------ 3️⃣ Historical vs New ------------------
     # Commented for now (new_data not available)
@@ -1,24 +1,35 @@
 import mlflow
 
-def log_evidently_metrics(report_dict, prefix=""):
+from auto_eda_project.mlflow.buffered_logger import get_logger
+
+def log_evidently_metrics(report_dict, prefix="", step=None, run_id=None):
     """
     Logs all numeric metrics from Evidently report dict to MLflow with proper prefixes.
+    Values are queued on the shared buffered logger and sent as batched requests
+    (flushed before a `get_logger().run(...)` block ends, or at exit).
 
     Parameters:
         report_dict (dict): Output from `report.as_dict()`
         prefix (str): Prefix for metric names (e.g., 'train_val__')
+        step (int): Optional MLflow step (for repeated snapshots in one run)
+        run_id (str): Target run (default: the active run)
     """
+    metrics = {}
     for metric in report_dict.get("metrics", []):
         metric_name = metric.get("metric", "unknown")
 
-        # 🔹 Log top-level numeric fields in "result"
+        # 🔹 Top-level numeric fields in "result"
         for key, value in metric.get("result", {}).items():
             if isinstance(value, (int, float)):
-                mlflow.log_metric(f"{prefix}{metric_name}__{key}", value)
+                metrics[f"{prefix}{metric_name}__{key}"] = value
 
-        # 🔹 Log column-wise metrics if available
+        # 🔹 Column-wise metrics if available
         column_metrics = metric.get("result", {}).get("column_metrics", {})
         for col_name, col_result in column_metrics.items():
             for sub_key, sub_val in col_result.items():
                 if isinstance(sub_val, (int, float)):
-                    mlflow.log_metric(f"{prefix}{col_name}__{sub_key}", sub_val)
+                    metrics[f"{prefix}{col_name}__{sub_key}"] = sub_val
+
+    if run_id is None:
+        run_id = (mlflow.active_run() or mlflow.start_run()).info.run_id
+    get_logger().log_metrics(run_id, metrics, step=step)
@@ -0,0 +1,307 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+# Compact reference profile built once at training time and stored next to the
+# model. New batches are scored against it (PSI / KS / chi-square / Jensen-Shannon)
+# without touching the reference data again, so a drift check costs O(current batch).
+
+PROFILE_VERSION = 1
+N_BINS = 10              # Quantile bins per numeric column (PSI / JS)
+N_QUANTILES = 101        # Reference CDF grid per numeric column (KS)
+TOP_K_CATEGORIES = 50    # Remaining categories are pooled into OTHER_CATEGORY
+OTHER_CATEGORY = "__other__"
+EPSILON = 1e-4           # Floor for empty bins in PSI
+
+# Same decision rules as Evidently's defaults: statistical tests on small batches,
+# distances on large ones (where p-values flag every tiny shift)
+SMALL_BATCH_ROWS = 1000
+P_VALUE_THRESHOLD = 0.05
+PSI_THRESHOLD = 0.2
+JS_THRESHOLD = 0.1
+DRIFT_SHARE = 0.5
+
+REFERENCE_PROFILE_ARTIFACT = "reference_profile.json"  # MLflow run artifact of each logged model
+
+
+def reference_profile_path(model_path: str) -> str:
+    """
+    Returns where the reference profile of a saved model lives.
+    """
+    return os.path.splitext(model_path)[0] + "_reference_profile.json"
+
+
+def _numeric_profile(values: np.ndarray, n_bins: int) -> dict:
+    values = np.sort(values[~np.isnan(values)])
+    if values.size == 0:
+        return {"kind": "numeric", "count": 0}
+
+    # Inner bin edges at the reference quantiles; duplicates collapse for discrete columns
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=edges.size + 1)
+
+    grid = np.unique(np.quantile(values, np.linspace(0, 1, N_QUANTILES)))
+    cdf = np.searchsorted(values, grid, side="right") / values.size
+
+    return {
+        "kind": "numeric",
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        "edges": edges.tolist(),
+        "proportions": (counts / values.size).tolist(),
+        "grid": grid.tolist(),
+        "cdf": cdf.tolist(),
+    }
+
+
+def _category_counts(series: pd.Series) -> pd.Series:
+    counts = series.value_counts(dropna=True)
+    counts.index = counts.index.astype(str)
+    return counts.groupby(level=0, sort=False).sum()
+
+
+def _categorical_profile(series: pd.Series, top_k: int) -> dict:
+    counts = _category_counts(series)
+    total = int(counts.sum())
+    if total == 0:
+        return {"kind": "categorical", "count": 0}
+
+    top = counts.nlargest(top_k)
+    proportions = (top / total).tolist() + [float(total - top.sum()) / total]
+    return {
+        "kind": "categorical",
+        "count": total,
+        "categories": top.index.tolist(),
+        "proportions": proportions,
+    }
+
+
+def build_reference_profile(df: pd.DataFrame, n_bins: int = N_BINS, top_k: int = TOP_K_CATEGORIES) -> dict:
+    """
+    Summarizes a reference dataset: quantile-binned histograms and a CDF grid for
+    numeric columns, top-k frequencies for the others, plus missing rates.
+
+    Parameters:
+        df (pd.DataFrame): Reference data (e.g. the training split, target included)
+        n_bins (int): Histogram bins per numeric column
+        top_k (int): Categories kept per categorical column
+
+    Returns:
+        dict: JSON-serializable profile
+    """
+    numeric_cols = set(df.select_dtypes(include='number').columns)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in numeric_cols:
+            profile = _numeric_profile(series.to_numpy(dtype=np.float64, na_value=np.nan), n_bins)
+        else:
+            profile = _categorical_profile(series, top_k)
+        profile["missing_rate"] = float(series.isna().mean()) if len(series) else 0.0
+        columns[col] = profile
+
+    return {
+        "version": PROFILE_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "n_rows": len(df),
+        "columns": columns,
+    }
+
+
+def with_prediction_profile(profile: dict, predictions, n_bins: int = N_BINS, decimals: int = 2) -> dict:
+    """
+    Returns a copy of `profile` with the distribution of a model's own predictions
+    (in the units served to clients) under "prediction". Live predictions are
+    compared to these rather than to the target: a regression model's predictions
+    are narrower than the target it predicts, so that comparison always drifts.
+
+    Predictions are rounded like the served ones (cents): tree models predict a few
+    distinct values that sit on the bin edges, and unrounded edges would put the
+    rounded live values in the neighbouring bin.
+    """
+    predictions = np.round(np.asarray(predictions, dtype=np.float64).ravel(), decimals)
+    prediction = _numeric_profile(predictions, n_bins)
+    prediction["missing_rate"] = 0.0
+    return {**profile, "prediction": prediction}
+
+
+def save_reference_profile(profile: dict, path: str):
+    """
+    Writes the profile as JSON.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    print(f"📐 Reference profile ({len(profile['columns'])} columns) saved at: {path}")
+
+
+def load_reference_profile(path: str) -> dict:
+    """
+    Reads a profile written by `save_reference_profile`.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        profile = json.load(f)
+    if profile.get("version") != PROFILE_VERSION:
+        raise ValueError(f"Unsupported reference profile version: {profile.get('version')}")
+    return profile
+
+
+# ---------------------------- Scoring ----------------------------
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Population stability index between two proportion vectors.
+    """
+    expected = np.clip(expected, EPSILON, None)
+    actual = np.clip(actual, EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def jensen_shannon(p: np.ndarray, q: np.ndarray) -> float:
+    """
+    Jensen-Shannon distance (base 2, in [0, 1]) between two proportion vectors.
+    """
+    m = (p + q) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kl_p = np.where(p > 0, p * np.log2(p / m), 0.0).sum()
+        kl_q = np.where(q > 0, q * np.log2(q / m), 0.0).sum()
+    return float(np.sqrt(max((kl_p + kl_q) / 2, 0.0)))
+
+
+def _decide(result: dict, kind: str) -> dict:
+    if result["count"] <= SMALL_BATCH_ROWS:
+        test = "ks" if kind == "numeric" else "chi2"
+        result["stattest"], result["drifted"] = test, result[f"{test}_p_value"] < P_VALUE_THRESHOLD
+    elif kind == "numeric":
+        result["stattest"], result["drifted"] = "psi", result["psi"] >= PSI_THRESHOLD
+    else:
+        result["stattest"], result["drifted"] = "jensen_shannon", result["jensen_shannon"] >= JS_THRESHOLD
+    return result
+
+
+def _ks_p_value(ks_stat: float, n: int, n_ref: int) -> float:
+    return float(special.kolmogorov(ks_stat * np.sqrt(n * n_ref / (n + n_ref))))
+
+
+def score_histogram(ref: dict, observed: np.ndarray) -> dict:
+    """
+    Scores counts binned like the profile (numeric: its bins, categorical: its
+    categories plus the trailing "other" bucket) against the reference proportions.
+    Numeric KS is computed on the bin boundaries, a lower bound of the exact statistic.
+
+    Returns:
+        dict: count, psi, jensen_shannon, ks_* or chi2_* and the drift decision
+    """
+    observed = np.asarray(observed, dtype=np.float64)
+    n = int(observed.sum())
+    if n == 0 or ref["count"] == 0:
+        return {"count": n, "drifted": False}
+
+    expected = np.asarray(ref["proportions"])
+    actual = observed / n
+    result = {"count": n, "psi": psi(expected, actual), "jensen_shannon": jensen_shannon(expected, actual)}
+
+    if ref["kind"] == "numeric":
+        ks_stat = float(np.abs(np.cumsum(actual) - np.cumsum(expected)).max())
+        result.update(ks_stat=ks_stat, ks_p_value=_ks_p_value(ks_stat, n, ref["count"]))
+    else:
+        # Pearson chi-square against the reference frequencies
+        expected_counts = np.clip(expected, EPSILON, None) * n
+        chi2_stat = float(((observed - expected_counts) ** 2 / expected_counts).sum())
+        result.update(chi2_stat=chi2_stat, chi2_p_value=float(stats.chi2.sf(chi2_stat, max(expected.size - 1, 1))))
+    return _decide(result, ref["kind"])
+
+
+def bin_numeric(ref: dict, values: np.ndarray) -> np.ndarray:
+    """
+    Counts non-missing values per profile bin.
+    """
+    edges = np.asarray(ref["edges"])
+    values = values[~np.isnan(values)]
+    return np.bincount(np.searchsorted(edges, values, side="right"), minlength=edges.size + 1)
+
+
+def _score_numeric(ref: dict, values: np.ndarray) -> dict:
+    values = np.sort(values[~np.isnan(values)])
+    n = values.size
+    if n == 0 or ref["count"] == 0:
+        return {"count": n, "drifted": n != ref["count"] and min(n, ref["count"]) == 0}
+
+    result = score_histogram(ref, bin_numeric(ref, values))
+
+    # Two-sample KS on the reference CDF grid (exact for discrete columns)
+    cur_cdf = np.searchsorted(values, np.asarray(ref["grid"]), side="right") / n
+    ks_stat = float(np.abs(cur_cdf - np.asarray(ref["cdf"])).max())
+    result.update(mean=float(values.mean()), ks_stat=ks_stat, ks_p_value=_ks_p_value(ks_stat, n, ref["count"]))
+    return _decide(result, "numeric")
+
+
+def _score_categorical(ref: dict, series: pd.Series) -> dict:
+    counts = _category_counts(series)
+    n = int(counts.sum())
+    if n == 0 or ref["count"] == 0:
+        return {"count": n, "drifted": n != ref["count"] and min(n, ref["count"]) == 0}
+
+    observed = counts.reindex(ref["categories"], fill_value=0).to_numpy(dtype=np.float64)
+    observed = np.append(observed, n - observed.sum())
+    result = score_histogram(ref, observed)
+    result["unseen_share"] = float(observed[-1] / n)
+    return result
+
+
+def score_drift(profile: dict, current: pd.DataFrame, drift_share: float = DRIFT_SHARE) -> dict:
+    """
+    Scores a batch against a reference profile, column by column.
+
+    Parameters:
+        profile (dict): Output of `build_reference_profile` / `load_reference_profile`
+        current (pd.DataFrame): New batch (columns absent from the profile are ignored)
+        drift_share (float): Share of drifted columns that flags dataset drift
+
+    Returns:
+        dict: {"drift_detected", "share_of_drifted_columns", "number_of_drifted_columns",
+        "number_of_columns", "missing_columns", "n_rows", "score_seconds", "column_metrics"}
+    """
+    start = time.perf_counter()
+    column_metrics = {}
+    missing_columns = []
+    for col, ref in profile["columns"].items():
+        if col not in current.columns:
+            missing_columns.append(col)
+            continue
+        series = current[col]
+        if ref["kind"] == "numeric":
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            result = _score_numeric(ref, values)
+        else:
+            result = _score_categorical(ref, series)
+        result["missing_rate"] = float(series.isna().mean()) if len(series) else 0.0
+        result["missing_rate_delta"] = result["missing_rate"] - ref["missing_rate"]
+        column_metrics[col] = result
+
+    n_drifted = sum(bool(result["drifted"]) for result in column_metrics.values())
+    share = n_drifted / len(column_metrics) if column_metrics else 0.0
+    return {
+        "drift_detected": bool(column_metrics) and share >= drift_share,
+        "share_of_drifted_columns": share,
+        "number_of_drifted_columns": n_drifted,
+        "number_of_columns": len(column_metrics),
+        "missing_columns": missing_columns,
+        "n_rows": len(current),
+        "score_seconds": time.perf_counter() - start,
+        "column_metrics": column_metrics,
+    }
+
+
+def as_report_dict(drift: dict, metric_name: str = "ReferenceProfileDrift") -> dict:
+    """
+    Wraps a drift result in the `report.as_dict()` layout so it can go through
+    `log_evidently_metrics` unchanged.
+    """
+    result = {k: v for k, v in drift.items() if k != "missing_columns"}
+    return {"metrics": [{"metric": metric_name, "result": result}]}
@@ -0,0 +1,247 @@
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+
+# MLflow's per-request limits for log_batch
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+MAX_ENTITIES_PER_BATCH = 1000
+MAX_DRAIN = 10 * MAX_ENTITIES_PER_BATCH  # Values handled per worker cycle
+
+_STOP = object()
+
+
+class BufferedMlflowLogger:
+    """
+    Buffers metrics, params and tags and sends them with batched `log_batch` calls
+    from a background thread, instead of one tracking-server round trip per value.
+
+    The buffer is a bounded queue: when it is full, callers wait up to
+    `put_timeout_s` and the value is dropped (and counted) after that. Failed
+    batches are retried with exponential backoff. `flush()` blocks until everything
+    queued so far has been sent; `run()` flushes before the MLflow run ends.
+
+    Parameters:
+        max_queue (int): Maximum number of buffered values
+        flush_interval_s (float): Longest time a value waits before being sent
+        max_retries (int): Attempts per batch before it is dropped
+        backoff_s (float): First retry delay (doubled on each retry)
+        put_timeout_s (float): How long a full buffer blocks a caller
+        client (MlflowClient): Client to send with (default: created on first use)
+    """
+
+    def __init__(self, max_queue=10_000, flush_interval_s=1.0, max_retries=5, backoff_s=0.5,
+                 put_timeout_s=5.0, client=None):
+        self.max_queue = max_queue
+        self.flush_interval_s = flush_interval_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.put_timeout_s = put_timeout_s
+        self._client = client
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = 0  # Values queued or being sent
+        self._done = threading.Condition()
+        self._flush_requested = threading.Event()
+        self._worker = None
+        self._lock = threading.Lock()
+
+        self.sent = 0
+        self.batches = 0
+        self.retries = 0
+        self.dropped = 0
+
+    # ---------------------------- Public API ----------------------------
+
+    def log_metric(self, run_id, key, value, step=None, timestamp=None):
+        timestamp = timestamp or int(time.time() * 1000)
+        self._put(run_id, Metric(key, float(value), timestamp, step or 0))
+
+    def log_metrics(self, run_id, metrics: dict, step=None):
+        timestamp = int(time.time() * 1000)
+        for key, value in metrics.items():
+            self.log_metric(run_id, key, value, step=step, timestamp=timestamp)
+
+    def log_param(self, run_id, key, value):
+        self._put(run_id, Param(key, str(value)))
+
+    def log_params(self, run_id, params: dict):
+        for key, value in params.items():
+            self.log_param(run_id, key, value)
+
+    def set_tag(self, run_id, key, value):
+        self._put(run_id, RunTag(key, str(value)))
+
+    def set_tags(self, run_id, tags: dict):
+        for key, value in tags.items():
+            self.set_tag(run_id, key, value)
+
+    def flush(self, timeout=None) -> bool:
+        """
+        Waits until every value queued so far has been sent (or dropped).
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._done:
+            if self._pending:
+                self._flush_requested.set()  # Worker sends without waiting for flush_interval_s
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+        return True
+
+    @contextmanager
+    def run(self, **start_run_kwargs):
+        """
+        `mlflow.start_run` that flushes the buffer before the run is ended.
+        """
+        with mlflow.start_run(**start_run_kwargs) as active_run:
+            try:
+                yield active_run
+            finally:
+                self.flush()
+
+    def stats(self) -> dict:
+        return {"pending": self._pending, "sent": self.sent, "batches": self.batches,
+                "retries": self.retries, "dropped": self.dropped}
+
+    # ---------------------------- Internals ----------------------------
+
+    def _put(self, run_id, entity):
+        self._ensure_worker()
+        with self._done:
+            self._pending += 1
+        try:
+            self._queue.put((run_id, entity), timeout=self.put_timeout_s)
+        except queue.Full:
+            self._finish(1, dropped=True)
+            print(f"⚠️ MLflow log buffer full, dropped {type(entity).__name__.lower()} '{entity.key}'")
+
+    def _finish(self, n, dropped=False):
+        with self._done:
+            self._pending -= n
+            if dropped:
+                self.dropped += n
+            if not self._pending:
+                self._flush_requested.clear()
+                self._done.notify_all()
+
+    def _ensure_worker(self):
+        # Started lazily so that forked processes (gunicorn, multiprocessing) get their own thread
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="mlflow-logger", daemon=True)
+                    self._worker.start()
+
+    def _drain(self):
+        # Blocks for the first value, then keeps collecting until flush_interval_s has
+        # passed or a flush is requested, so bursts of values share one request
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval_s
+        while items[-1] is not _STOP and len(items) < MAX_DRAIN:
+            try:
+                items.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._flush_requested.is_set():
+                break
+            try:
+                items.append(self._queue.get(timeout=min(remaining, 0.05)))
+            except queue.Empty:
+                pass
+        return items
+
+    def _run(self):
+        while True:
+            items = self._drain()
+            stop = items[-1] is _STOP
+            if stop:
+                items.pop()
+
+            by_run = defaultdict(lambda: ([], [], []))
+            for run_id, entity in items:
+                metrics, params, tags = by_run[run_id]
+                (metrics if isinstance(entity, Metric) else params if isinstance(entity, Param) else tags).append(entity)
+
+            for run_id, (metrics, params, tags) in by_run.items():
+                # log_batch rejects repeated param keys; keep the latest value
+                unique_params = list({param.key: param for param in params}.values())
+                if len(unique_params) < len(params):
+                    self._finish(len(params) - len(unique_params))
+                    params = unique_params
+                for batch in _split_batches(metrics, params, tags):
+                    self._send(run_id, *batch)
+            if stop:
+                return
+
+    def _send(self, run_id, metrics, params, tags):
+        n = len(metrics) + len(params) + len(tags)
+        client = self._client = self._client or MlflowClient()
+        delay = self.backoff_s
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                client.log_batch(run_id, metrics=metrics, params=params, tags=tags)
+                self.sent += n
+                self.batches += 1
+                self._finish(n)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"❌ MLflow log_batch failed for run {run_id} after {attempt} attempts, "
+                          f"dropping {n} values: {e}")
+                    self._finish(n, dropped=True)
+                    return
+                self.retries += 1
+                time.sleep(delay)
+                delay *= 2
+
+    def close(self, timeout=10.0):
+        """
+        Flushes and stops the background thread.
+        """
+        if self._worker is not None and self._worker.is_alive():
+            self.flush(timeout)
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+
+
+def _split_batches(metrics, params, tags):
+    # Chunks one run's values into requests within MLflow's log_batch limits
+    while metrics or params or tags:
+        batch_params, params = params[:MAX_PARAMS_PER_BATCH], params[MAX_PARAMS_PER_BATCH:]
+        batch_tags, tags = tags[:MAX_TAGS_PER_BATCH], tags[MAX_TAGS_PER_BATCH:]
+        room = min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags))
+        batch_metrics, metrics = metrics[:room], metrics[room:]
+        yield batch_metrics, batch_params, batch_tags
+
+
+_shared_logger = None
+_shared_lock = threading.Lock()
+
+
+def get_logger() -> BufferedMlflowLogger:
+    """
+    Returns the process-wide buffered logger (flushed at interpreter exit).
+    """
+    global _shared_logger
+    if _shared_logger is None:
+        with _shared_lock:
+            if _shared_logger is None:
+                _shared_logger = BufferedMlflowLogger()
+                atexit.register(_shared_logger.close)
+    return _shared_logger
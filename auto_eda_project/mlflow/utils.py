@@ -1,7 +1,14 @@
+import os
+import shutil
+import tempfile
+
 import mlflow
 import mlflow.sklearn
 from mlflow.tracking import MlflowClient
 
+from auto_eda_project.mlflow.buffered_logger import get_logger
+from auto_eda_project.evidently_ai.reference_profile import REFERENCE_PROFILE_ARTIFACT
+
 
 def start_experiment(experiment_name="CAPSTONE_Salary_Experiment"):
     """
@@ -12,7 +19,8 @@ def start_experiment(experiment_name="CAPSTONE_Salary_Experiment"):
     print(f"🧪 Tracking experiment: {experiment_name}")
 
 
-def log_model_and_metrics(model, model_name, metrics: dict, run_name="ModelRun"):
+def log_model_and_metrics(model, model_name, metrics: dict, run_name="ModelRun", params: dict = None,
+                          reference_profile: dict = None):
     """
     Logs a trained model and its metrics to MLflow.
     
@@ -21,18 +29,41 @@ def log_model_and_metrics(model, model_name, metrics: dict, run_name="ModelRun")
         model_name (str): Name to store model under in artifacts
         metrics (dict): Dictionary of evaluation metrics (e.g., {'rmse': 1.2, 'r2': 0.9})
         run_name (str): MLflow run name
+        params (dict): Optional run parameters (e.g., search strategy and budget)
+        reference_profile (dict): Training-data profile, logged so servers loading this
+            model from the registry monitor drift against its own training data
     """
-    with mlflow.start_run(run_name=run_name) as run:
-        mlflow.sklearn.log_model(sk_model=model, artifact_path=model_name)
+    logger = get_logger()
+    with logger.run(run_name=run_name) as run:
+        run_id = run.info.run_id
 
-        for k, v in metrics.items():
-            mlflow.log_metric(k, v)
+        # Params/metrics go out as one batched request while the model artifact uploads
+        if params:
+            logger.log_params(run_id, params)
+        logger.log_metrics(run_id, metrics)
+
+        mlflow.sklearn.log_model(sk_model=model, artifact_path=model_name)
+        if reference_profile is not None:
+            mlflow.log_dict(reference_profile, REFERENCE_PROFILE_ARTIFACT)
 
-        run_id = run.info.run_id
         print(f"📌 Model logged to run: {run_id}")
         return run_id
 
 
+def log_run_artifact(run_id, local_path, artifact_file):
+    """
+    Uploads a local file to a finished run under a fixed name (`artifact_file`),
+    whatever the local file is called.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        staged = os.path.join(tmp_dir, artifact_file)
+        shutil.copyfile(local_path, staged)
+        MlflowClient().log_artifact(run_id, staged)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def compare_and_register_models(run_metrics_dict, model_name_prefix="BestSalaryModel"):
     """
     Compares multiple MLflow runs and registers the best model based on RMSE (lower is better).
@@ -0,0 +1,142 @@
+import copy
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from xgboost import XGBRegressor
+
+from preprocessing.preprocessing import log_transform_target, restore_float64
+from model.model_io import save_model_artifact, load_model_artifact
+from preprocessing.fast_transform import (
+    export_fast_preprocessor, fast_preprocessor_path, PreprocessorCompileError, FAST_PREPROCESSOR_ARTIFACT
+)
+from auto_eda_project.mlflow.utils import (
+    start_experiment, log_model_and_metrics, compare_and_register_models, log_run_artifact
+)
+from auto_eda_project.evidently_ai.reference_profile import (
+    build_reference_profile, save_reference_profile, reference_profile_path, with_prediction_profile
+)
+
+# Incremental retraining: continue the current best model on recent data with its
+# existing hyperparameters and fitted preprocessing, instead of a new grid search.
+
+EXTRA_BOOSTING_ROUNDS = 100   # XGBoost rounds added on top of the existing booster
+EXTRA_TREES = 50              # RandomForest trees added with warm_start
+MAX_RMSE_REGRESSION = 0.05    # Accept if holdout RMSE is at most 5% worse than the current model
+
+FAMILY_NAMES = {XGBRegressor: "XGBoost", RandomForestRegressor: "RandomForest"}
+
+
+def _rmse(model, X, y):
+    return float(np.sqrt(mean_squared_error(y, model.predict(X))))
+
+
+def continue_training(pipe: Pipeline, X_train, y_train, extra_rounds=EXTRA_BOOSTING_ROUNDS,
+                      extra_trees=EXTRA_TREES) -> Pipeline:
+    """
+    Returns a copy of a fitted pipeline updated on new data, keeping its fitted
+    preprocessing (so the feature layout is unchanged) and hyperparameters.
+
+    XGBoost continues boosting from the existing booster, RandomForest grows
+    `extra_trees` more trees with warm_start, and any other regressor is refit
+    with its current hyperparameters.
+    """
+    preprocessor = pipe.named_steps['preprocessing']
+    regressor = pipe.named_steps['regressor']
+    X_t = preprocessor.transform(X_train)
+
+    if isinstance(regressor, XGBRegressor):
+        updated = clone(regressor).set_params(n_estimators=extra_rounds, early_stopping_rounds=None)
+        updated.fit(X_t, y_train, xgb_model=regressor.get_booster(), verbose=False)
+        updated.set_params(n_estimators=updated.get_booster().num_boosted_rounds())  # Total, for logging
+    elif isinstance(regressor, RandomForestRegressor):
+        updated = copy.deepcopy(regressor)  # The current model stays untouched
+        updated.set_params(warm_start=True, n_estimators=regressor.n_estimators + extra_trees)
+        updated.fit(X_t, y_train)
+        updated.set_params(warm_start=False)
+    else:
+        updated = clone(regressor).fit(X_t, y_train)
+
+    return Pipeline([('preprocessing', preprocessor), ('regressor', updated)])
+
+
+def incremental_retrain(df, target="adjusted_total_usd", model_path=None, save_path=None, recent_rows=None,
+                        extra_rounds=EXTRA_BOOSTING_ROUNDS, extra_trees=EXTRA_TREES,
+                        max_regression=MAX_RMSE_REGRESSION, register=True):
+    """
+    Updates the current best model on new data without a hyperparameter search.
+    The caller records the run (e.g. the DAG's pipeline state) once it is accepted.
+
+    The most recent rows are split 80/20; the updated model must score within
+    `max_regression` of the current model's RMSE on that holdout, otherwise it is
+    rejected and the caller should fall back to a full `train_models` search.
+
+    Parameters:
+        df (pd.DataFrame): Cleaned dataset in watermark order (target included)
+        model_path (str): Current best pipeline (.pkl)
+        save_path (str): Where to save an accepted model (default: model_path)
+        recent_rows (int): Use only the last N rows (None = all)
+        max_regression (float): Allowed relative RMSE increase vs the current model
+        register (bool): Log and register an accepted model in MLflow
+
+    Returns:
+        dict: {"accepted", "model", "family", "baseline_rmse", "rmse", "train_time_s"}
+    """
+    save_path = save_path or model_path
+    current = load_model_artifact(model_path, mmap=False)  # Its RandomForest may be extended in place
+    family = FAMILY_NAMES.get(type(current.named_steps['regressor']), "DecisionTree")
+
+    recent = df.tail(recent_rows) if recent_rows else df
+    X = restore_float64(recent.drop(columns=[target]))
+    y = log_transform_target(recent[target])
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    start = time.perf_counter()
+    updated = continue_training(current, X_train, y_train, extra_rounds=extra_rounds, extra_trees=extra_trees)
+    train_time_s = time.perf_counter() - start
+
+    baseline_rmse = _rmse(current, X_test, y_test)
+    rmse = _rmse(updated, X_test, y_test)
+    accepted = rmse <= baseline_rmse * (1 + max_regression)
+    print(f"🔁 Incremental {family}: holdout RMSE {baseline_rmse:.4f} -> {rmse:.4f} "
+          f"in {train_time_s:.1f}s ({'accepted' if accepted else 'rejected'})")
+
+    if accepted:
+        save_model_artifact(updated, save_path)
+        print(f"📦 Saved incrementally updated model at: {save_path}")
+        # Future drift checks score the whole loaded dataset, so the reference is that
+        # dataset (minus the holdout) rather than only the recent rows; predictions are
+        # the updated model's on the holdout it was accepted on
+        profile = with_prediction_profile(build_reference_profile(df.drop(index=X_test.index)),
+                                          np.expm1(updated.predict(X_test)))
+        save_reference_profile(profile, reference_profile_path(save_path))
+
+        # The regressor changed: re-validate and re-export the fast path for it
+        fast_path = fast_preprocessor_path(save_path)
+        try:
+            export_fast_preprocessor(updated, X_test, fast_path)
+        except PreprocessorCompileError as e:
+            print(f"⚠️ Skipping fast preprocessor export: {e}")
+            fast_path = None
+
+        if register:
+            start_experiment("CAPSTONE_Salary_Experiment")
+            run_id = log_model_and_metrics(
+                model=updated,
+                model_name=family,
+                metrics={"rmse": rmse, "baseline_rmse": baseline_rmse, "train_time_s": train_time_s},
+                run_name=f"{family}_Incremental_Run",
+                params={"retrain_mode": "incremental", "recent_rows": recent_rows,
+                        "extra_rounds": extra_rounds, "extra_trees": extra_trees},
+                reference_profile=profile,
+            )
+            if fast_path:
+                log_run_artifact(run_id, fast_path, FAST_PREPROCESSOR_ARTIFACT)
+            compare_and_register_models({family: {"run_id": run_id, "rmse": rmse}})
+
+    return {"accepted": accepted, "model": updated if accepted else current, "family": family,
+            "baseline_rmse": baseline_rmse, "rmse": rmse, "train_time_s": train_time_s}
@@ -0,0 +1,120 @@
+import os
+import time
+
+import joblib
+
+from cache.dataset_cache import atomic_temp_path
+
+# Saved pipelines are plain (uncompressed) joblib files: the NumPy arrays are stored
+# raw so `joblib.load(..., mmap_mode='r')` maps them from the page cache instead of
+# decompressing and copying them into every process.
+#
+# sklearn trees copy their node arrays into their own buffers while unpickling, so
+# for tree ensembles the page cache only saves the read/decompress cost. Sharing one
+# copy of the trees between workers comes from loading the model once in a
+# pre-forking server (gunicorn preload_app, see Flask/gunicorn.conf.py).
+
+MMAP_MODE = "r"
+
+
+def save_model_artifact(model, path: str) -> str:
+    """
+    Saves a model uncompressed, via a temp file + rename so that a server reading
+    the path never sees a half-written file.
+    """
+    with atomic_temp_path(os.path.dirname(os.path.abspath(path))) as tmp_path:
+        joblib.dump(model, tmp_path, compress=0)
+        os.replace(tmp_path, path)
+    return path
+
+
+def load_model_artifact(path: str, mmap: bool = True):
+    """
+    Loads a saved model, memory-mapping its NumPy arrays read-only when `mmap` is set
+    (compressed files written by older versions load normally).
+    """
+    start = time.perf_counter()
+    model = joblib.load(path, mmap_mode=MMAP_MODE if mmap else None)
+    print(f"📦 Loaded model artifact in {time.perf_counter() - start:.2f}s: {path}")
+    return model
+
+
+def process_memory_mb() -> dict:
+    """
+    Returns this process's memory from /proc (Linux): RSS, PSS (shared pages split
+    between the processes mapping them) and USS-like private memory, in MB.
+    Empty on other platforms.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.split()[-1:] == ["kB"]}
+    except OSError:
+        return {}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {"rss_mb": round(fields.get("Rss", 0) / 1024, 1), "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+            "private_mb": round(private / 1024, 1)}
+
+
+def benchmark_worker_memory(path: str, workers: int = 3, preload: bool = True, settle_s: float = 1.0) -> dict:
+    """
+    Forks `workers` processes the way gunicorn does and reports how long they take to
+    be ready to predict and how much memory each one holds (Linux only).
+
+    Parameters:
+        path (str): Saved model (.pkl)
+        workers (int): Number of forked workers
+        preload (bool): Load once before forking (preload_app) instead of in every worker
+        settle_s (float): Time all workers stay alive before measuring, so PSS splits shared pages
+
+    Returns:
+        dict: {"ready_s", "workers": [process_memory_mb() of each worker]}
+    """
+    import gc
+    import json
+    import numpy as np
+
+    def warm_up(model):
+        # One prediction on the bare regressor touches the tree arrays like a request does
+        regressor = model.steps[-1][1] if hasattr(model, "steps") else model
+        regressor.predict(np.zeros((10, regressor.n_features_in_)))
+
+    start = time.perf_counter()
+    model = None
+    if preload:
+        model = load_model_artifact(path, mmap=False)
+        gc.freeze()
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            worker_model = model if preload else load_model_artifact(path, mmap=False)
+            warm_up(worker_model)
+            ready_s = time.perf_counter() - start
+            time.sleep(settle_s)
+            report = {"ready_s": round(ready_s, 2), **process_memory_mb()}
+            os.write(write_fd, (json.dumps(report) + "\n").encode())
+            os._exit(0)
+        pids.append(pid)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        reports = [json.loads(line) for line in f]
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return {"ready_s": max(r.pop("ready_s") for r in reports), "workers": reports}
+
+
+if __name__ == "__main__":
+    # Usage (from auto_eda_project): python -m model.model_io [model_path] [workers]
+    # Compares loading the model in every worker with gunicorn's preload_app + fork.
+    import sys
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "save_model/best_capstone_model.pkl"
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    for mode, preload in (("load per worker", False), ("preload + fork", True)):
+        result = benchmark_worker_memory(model_path, workers=n_workers, preload=preload)
+        print(f"⏱️ {mode}: {n_workers} workers ready in {result['ready_s']:.1f}s")
+        for i, memory in enumerate(result["workers"]):
+            print(f"   worker {i}: {memory}")
@@ -1,24 +1,286 @@
 
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, GridSearchCV, HalvingGridSearchCV, ParameterGrid
 from sklearn.pipeline import Pipeline
+from sklearn.metrics import mean_squared_error
+from sklearn.base import clone
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor
 from xgboost import XGBRegressor
-from preprocessing.preprocessing import get_preprocessor, log_transform_target
-from auto_eda_project.mlflow.utils import start_experiment, log_model_and_metrics, compare_and_register_models
+from preprocessing.preprocessing import get_preprocessor, log_transform_target, feature_matrix_memory, restore_float64
+from preprocessing.fast_transform import (
+    export_fast_preprocessor, fast_preprocessor_path, PreprocessorCompileError, FAST_PREPROCESSOR_ARTIFACT
+)
+from model.model_io import save_model_artifact
+from auto_eda_project.mlflow.utils import (
+    start_experiment, log_model_and_metrics, compare_and_register_models, log_run_artifact
+)
+from auto_eda_project.evidently_ai.reference_profile import (
+    build_reference_profile, save_reference_profile, reference_profile_path, with_prediction_profile
+)
 
 
+import os
+import multiprocessing
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 import joblib
+from joblib import Memory
+
+# Bump when the model families, grids, split or target transform change, so that
+# scheduled pipelines retrain even if the data did not change
+TRAINING_CONFIG_VERSION = 1
 
 SCORING_METRIC = 'neg_mean_squared_error'
+CV_FOLDS = 5
+
+# 🔎 Search strategies: exhaustive grid or successive halving (budgeted)
+SEARCH_STRATEGIES = ("grid", "halving")
+HALVING_FACTOR = 3
+XGB_EARLY_STOPPING_ROUNDS = 20
+XGB_MAX_ROUNDS = 500
+
+
+@contextmanager
+def preprocessing_cache(enabled=True):
+    """
+    Temporary joblib cache shared by every pipeline fit in one training run.
+
+    With `Pipeline(memory=...)`, the fitted preprocessing step is keyed on its params
+    and the fold data, so it is computed once per CV fold (plus once for the refit)
+    and reused by every grid candidate of every model family. The cache directory is
+    removed when the run ends.
+    """
+    if not enabled:
+        yield None
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix="capstone_preprocessing_cache_")
+    try:
+        yield Memory(location=cache_dir, verbose=0)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def count_cached_fits(memory):
+    """
+    Returns the number of distinct preprocessing fits stored in a joblib cache.
+    """
+    count = 0
+    for root, dirs, files in os.walk(memory.location):
+        count += "output.pkl" in files
+    return count
+
+def build_search(pipe, cfg, strategy="grid", n_jobs=-1):
+    """
+    Returns the hyperparameter search for one model family.
+
+    "halving" runs successive halving on the family's `halving_resource`: rows
+    ("n_samples") or the number of trees ("regressor__n_estimators", whose grid
+    values then only set the maximum budget).
+    """
+    if strategy == "grid":
+        return GridSearchCV(
+            pipe, cfg['params'], cv=CV_FOLDS, scoring=SCORING_METRIC, n_jobs=n_jobs, verbose=1
+        )
+
+    resource = cfg.get('halving_resource', 'n_samples')
+    params = {k: v for k, v in cfg['params'].items() if k != resource}
+    max_resources = max(cfg['params'][resource]) if resource in cfg['params'] else 'auto'
+    return HalvingGridSearchCV(
+        pipe, params, resource=resource, max_resources=max_resources, min_resources='exhaust',
+        factor=HALVING_FACTOR, cv=CV_FOLDS, scoring=SCORING_METRIC, n_jobs=n_jobs,
+        random_state=42, verbose=1
+    )
+
+
+def budgeted_grid_search(pipe, param_grid, X_train, y_train, deadline, n_jobs=-1):
+    """
+    Grid search that stops between candidates once the wall-clock `deadline`
+    (time.time()) has passed. Candidates are cross-validated in chunks of one per
+    CV worker; at least one chunk always runs, and the best candidate found so far
+    is refit on all of X_train.
+
+    Returns:
+        tuple: (fitted best pipeline, number of candidates evaluated)
+    """
+    candidates = list(ParameterGrid(param_grid))
+    workers = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count()
+    chunk_size = max(1, workers)
+
+    best_score, best_params, evaluated = -np.inf, None, 0
+    for start in range(0, len(candidates), chunk_size):
+        if evaluated and time.time() >= deadline:
+            print(f"⏱️ Time budget reached: {evaluated}/{len(candidates)} candidates evaluated")
+            break
+        chunk = [{k: [v] for k, v in params.items()} for params in candidates[start:start + chunk_size]]
+        search = GridSearchCV(pipe, chunk, cv=CV_FOLDS, scoring=SCORING_METRIC, n_jobs=n_jobs, refit=False)
+        search.fit(X_train, y_train)
+        evaluated += len(chunk)
+        i = int(np.nanargmax(search.cv_results_['mean_test_score']))
+        if search.cv_results_['mean_test_score'][i] > best_score:
+            best_score, best_params = search.cv_results_['mean_test_score'][i], search.cv_results_['params'][i]
+
+    return clone(pipe).set_params(**best_params).fit(X_train, y_train), evaluated
+
+
+def refit_xgb_with_early_stopping(pipe, X_train, y_train):
+    """
+    Refits an XGBoost pipeline with early stopping on a held-out validation fold
+    and returns it trained on all of X_train with the selected number of rounds.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.1, random_state=42)
+    preprocessor = clone(pipe.named_steps['preprocessing']).fit(X_fit, y_fit)
+
+    regressor = clone(pipe.named_steps['regressor']).set_params(
+        n_estimators=XGB_MAX_ROUNDS, early_stopping_rounds=XGB_EARLY_STOPPING_ROUNDS
+    )
+    regressor.fit(preprocessor.transform(X_fit), y_fit,
+                  eval_set=[(preprocessor.transform(X_val), y_val)], verbose=False)
+    best_rounds = regressor.best_iteration + 1
+    print(f"⏹️ XGBoost early stopping: {best_rounds} rounds")
+
+    final = clone(pipe).set_params(regressor__n_estimators=best_rounds, memory=None)
+    return final.fit(X_train, y_train)
+
+
+def fit_model_family(name, cfg, preprocessor, memory, X_train, y_train, search="grid",
+                     cv_jobs=-1, estimator_threads=None, deadline=None):
+    """
+    Runs the hyperparameter search for one model family.
+
+    Parameters:
+        cv_jobs (int): Parallel CV fits (GridSearchCV n_jobs)
+        estimator_threads (int): Threads inside each estimator (n_jobs / nthread);
+            None keeps the estimator default (and is used for single-threaded estimators)
+        deadline (float): Wall-clock time (time.time()) after which a grid search
+            stops evaluating candidates. Successive halving always runs to completion.
+
+    Returns:
+        dict: {"best_estimator", "search_time_s", "n_fits"}
+    """
+    model = clone(cfg['model'])
+    if estimator_threads is not None:
+        model.set_params(n_jobs=estimator_threads)
+
+    pipe = Pipeline([
+        ('preprocessing', preprocessor),
+        ('regressor', model)
+    ], memory=memory)
+
+    start = time.perf_counter()
+    if deadline is not None and search == "grid":
+        best_estimator, n_candidates = budgeted_grid_search(pipe, cfg['params'], X_train, y_train,
+                                                            deadline, n_jobs=cv_jobs)
+    else:
+        grid = build_search(pipe, cfg, strategy=search, n_jobs=cv_jobs)
+        grid.fit(X_train, y_train)
+        best_estimator, n_candidates = grid.best_estimator_, len(grid.cv_results_['params'])
+    best_estimator.set_params(memory=None)  # Detach the temporary cache
+
+    if search == "halving" and isinstance(model, XGBRegressor):
+        best_estimator = refit_xgb_with_early_stopping(best_estimator, X_train, y_train)
+
+    if estimator_threads is not None:
+        # Saved models keep the estimator's default threading for inference
+        best_estimator.set_params(regressor__n_jobs=cfg['model'].get_params()['n_jobs'])
+
+    return {
+        "best_estimator": best_estimator,
+        "search_time_s": time.perf_counter() - start,
+        "n_fits": n_candidates * CV_FOLDS + 1,
+    }
+
+
+def allocate_cpu_budget(models, cpu_budget):
+    """
+    Splits a core budget across model families in proportion to their number of
+    grid candidates, then splits each family's share between CV workers and
+    estimator-internal threads so that cv_jobs * threads never exceeds it.
+
+    Returns:
+        dict: {name: (cv_jobs, estimator_threads)}
+    """
+    weights = {name: len(ParameterGrid(cfg['params'])) for name, cfg in models.items()}
+    total = sum(weights.values())
+    shares = {name: max(1, int(cpu_budget * w / total)) for name, w in weights.items()}
+
+    # Hand leftover cores to the largest searches first
+    leftover = cpu_budget - sum(shares.values())
+    for name in sorted(weights, key=weights.get, reverse=True)[:max(leftover, 0)]:
+        shares[name] += 1
+
+    allocation = {}
+    for name, cores in shares.items():
+        if 'n_jobs' in models[name]['model'].get_params():
+            cv_jobs = min(cores, CV_FOLDS)
+            allocation[name] = (cv_jobs, max(1, cores // cv_jobs))
+        else:
+            allocation[name] = (cores, None)
+    return allocation
+
+
+def train_families_concurrently(models, preprocessor, memory, X_train, y_train, search="grid", cpu_budget=None,
+                                deadline=None):
+    """
+    Trains all model families at the same time, one process per family, sharing a
+    single core budget (default: all cores) without nested oversubscription. Every
+    family stops its grid search at the shared `deadline`.
+
+    Returns:
+        dict: {name: fit_model_family result}
+    """
+    cpu_budget = cpu_budget or os.cpu_count()
+    allocation = allocate_cpu_budget(models, cpu_budget)
+    for name, (cv_jobs, threads) in allocation.items():
+        print(f"🧵 {name}: {cv_jobs} CV workers x {threads or 1} estimator threads")
+
+    # spawn: each family gets a clean process with its own joblib worker pool
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(len(models), cpu_budget), mp_context=ctx) as pool:
+        futures = {
+            name: pool.submit(fit_model_family, name, cfg, preprocessor, memory,
+                              X_train, y_train, search, *allocation[name], deadline)
+            for name, cfg in models.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def train_models(df, target="adjusted_total_usd", save_path=None,
+                 sparse=False, min_frequency=None, max_categories=None, cache_preprocessing=True,
+                 search="grid", time_budget_s=None, parallel_families=False, cpu_budget=None):
+    """
+    Grid-searches DecisionTree, RandomForest and XGBoost pipelines, logs each to
+    MLflow, saves the best one and registers it.
+
+    Parameters:
+        sparse (bool): Keep one-hot features in CSR format end to end
+        min_frequency (int|float): Group rare categories into an "infrequent" column
+        max_categories (int): Cap on one-hot columns per categorical feature
+        cache_preprocessing (bool): Fit the preprocessor once per CV fold and reuse it
+            across all grid candidates and model families
+        search (str): "grid" (exhaustive) or "halving" (successive halving, with
+            XGBoost early stopping on a validation fold)
+        time_budget_s (float): Wall-clock budget for the whole search. Grid searches
+            stop between candidates once it is used (each family evaluates at least
+            one batch of candidates, and the best one found is refit), and families
+            not started by then are skipped. With search="halving" a started family
+            runs to completion. Applies to sequential and parallel families.
+        parallel_families (bool): Train all model families concurrently
+        cpu_budget (int): Total cores shared by concurrent families (default: all)
+    """
+    if search not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search strategy: {search}. Expected one of {SEARCH_STRATEGIES}")
 
-def train_models(df, target="adjusted_total_usd", save_path=None):
     # 🚀 Start MLflow experiment
     start_experiment("CAPSTONE_Salary_Experiment")
 
     # 🔹 Split features and target
-    X = df.drop(columns=[target])
+    X = restore_float64(df.drop(columns=[target]))
     y = log_transform_target(df[target])
 
     # 🧪 Train-Test Split (80% train, 20% test)
@@ -26,22 +288,38 @@ def train_models(df, target="adjusted_total_usd", save_path=None):
         X, y, test_size=0.2, random_state=42
     )
 
+    # 📐 Reference profile of the training split (logged with every model, for drift checks)
+    profile = build_reference_profile(df.loc[X_train.index])
+
     # ⚙️ Get preprocessing pipeline
-    preprocessor = get_preprocessor(df)
+    preprocessor = get_preprocessor(df, sparse=sparse, min_frequency=min_frequency,
+                                    max_categories=max_categories)
+
+    if sparse or cache_preprocessing:
+        start = time.perf_counter()
+        X_train_t = clone(preprocessor).fit_transform(X_train)
+        preprocess_fit_s = time.perf_counter() - start
+
+    if sparse:
+        mem = feature_matrix_memory(X_train_t)
+        print(f"🧮 Sparse feature matrix {mem['shape']}: {mem['memory_mb']} MB "
+              f"(dense: {mem['dense_memory_mb']} MB, saved: {mem['saved_mb']} MB)")
 
     models = {
         "DecisionTree": {
-            "model": DecisionTreeRegressor(),
+            "model": DecisionTreeRegressor(random_state=42),
             "params": {
                 "regressor__max_depth": [3, 6, 5, 10]
-            }
+            },
+            "halving_resource": "n_samples"
         },
         "RandomForest": {
             "model": RandomForestRegressor(random_state=42),
             "params": {
                 "regressor__n_estimators": [100, 200],
                 "regressor__max_depth": [3, 5, 7, 10, 15]
-            }
+            },
+            "halving_resource": "regressor__n_estimators"
         },
         "XGBoost": {
             "model": XGBRegressor(random_state=42, verbosity=0),
@@ -51,36 +329,68 @@ def train_models(df, target="adjusted_total_usd", save_path=None):
                 "regressor__learning_rate": [0.05, 0.1],
                 "regressor__reg_alpha": [0.1, 0.5],
                 "regressor__reg_lambda": [1.0]
-            }
+            },
+            "halving_resource": "regressor__n_estimators"
         }
     }
 
     best_model = None
     best_score = float("inf")
     best_name = None
+    best_profile = None
     run_metrics_dict = {}
+    results = {}
+    run_start = time.perf_counter()
+    deadline = time.time() + time_budget_s if time_budget_s is not None else None
 
-    for name, cfg in models.items():
-        pipe = Pipeline([
-            ('preprocessing', preprocessor),
-            ('regressor', cfg['model'])
-        ])
+    with preprocessing_cache(cache_preprocessing) as memory:
+        if parallel_families:
+            results = train_families_concurrently(models, preprocessor, memory, X_train, y_train,
+                                                  search=search, cpu_budget=cpu_budget, deadline=deadline)
+        else:
+            for name, cfg in models.items():
+                elapsed = time.perf_counter() - run_start
+                if time_budget_s is not None and results and elapsed >= time_budget_s:
+                    print(f"⏭️ Skipping {name}: time budget of {time_budget_s}s used ({elapsed:.1f}s)")
+                    continue
+                results[name] = fit_model_family(name, cfg, preprocessor, memory, X_train, y_train, search=search,
+                                                 deadline=deadline)
 
-        grid = GridSearchCV(
-            pipe, cfg['params'], cv=5, scoring=SCORING_METRIC, n_jobs=-1, verbose=1
-        )
-        grid.fit(X_train, y_train)
+        # ⏱️ Report preprocessing work avoided by the cache
+        if memory is not None:
+            total_fits = sum(result['n_fits'] for result in results.values())
+            computed_fits = count_cached_fits(memory)
+            reused_fits = total_fits - computed_fits
+            print(f"⏱️ Preprocessing cache: {computed_fits} fits computed, {reused_fits} reused "
+                  f"(~{reused_fits * preprocess_fit_s:.1f}s saved)")
 
-        test_neg_mse = grid.score(X_test, y_test)
-        test_rmse = np.sqrt(-test_neg_mse)
-        print(f"✅ {name} RMSE on Test Set: {test_rmse:.4f}")
+    # 🔁 Evaluate, log and select in a fixed family order (independent of completion order)
+    for name in models:
+        if name not in results:
+            continue
+        best_estimator = results[name]['best_estimator']
+        search_time_s = results[name]['search_time_s']
 
-        # 🔁 Log model and RMSE to MLflow
+        test_pred = best_estimator.predict(X_test)
+        test_rmse = np.sqrt(mean_squared_error(y_test, test_pred))
+        # Holdout predictions in USD: the reference for live prediction drift (unseen rows,
+        # like live traffic; training-row predictions would be overfit)
+        family_profile = with_prediction_profile(profile, np.expm1(test_pred))
+        print(f"✅ {name} RMSE on Test Set: {test_rmse:.4f} | search time: {search_time_s:.1f}s")
+
+        # 🔁 Log model, RMSE and search strategy/budget to MLflow
         run_id = log_model_and_metrics(
-            model=grid.best_estimator_,
+            model=best_estimator,
             model_name=name,
-            metrics={"rmse": test_rmse},
-            run_name=f"{name}_Run"
+            metrics={"rmse": test_rmse, "search_time_s": search_time_s},
+            run_name=f"{name}_Run",
+            params={
+                "search_strategy": search,
+                "time_budget_s": time_budget_s,
+                "halving_factor": HALVING_FACTOR if search == "halving" else None,
+                "parallel_families": parallel_families,
+            },
+            reference_profile=family_profile,
         )
 
         run_metrics_dict[name] = {
@@ -89,17 +399,31 @@ def train_models(df, target="adjusted_total_usd", save_path=None):
         }
 
         if test_rmse < best_score:
-            best_model = grid.best_estimator_
+            best_model = best_estimator
+            best_profile = family_profile
             best_score = test_rmse
             best_name = name
 
+    print(f"⏱️ Total search time: {time.perf_counter() - run_start:.1f}s")
     print(f"\n🏆 Best Model: {best_name} | Test RMSE: {best_score:.4f}")
 
     # 💾 Save locally as .pkl
     if save_path:
-        joblib.dump(best_model, save_path)
+        save_model_artifact(best_model, save_path)  # Uncompressed: servers can mmap it
         print(f"📦 Saved best model locally at: {save_path}")
 
+        # ⚡ Export the compiled low-latency preprocessing path next to the model and with
+        # the best run, so registry-served versions get the same validated fast path
+        fast_path = fast_preprocessor_path(save_path)
+        try:
+            export_fast_preprocessor(best_model, X_test, fast_path)
+            log_run_artifact(run_metrics_dict[best_name]["run_id"], fast_path, FAST_PREPROCESSOR_ARTIFACT)
+        except PreprocessorCompileError as e:
+            print(f"⚠️ Skipping fast preprocessor export: {e}")
+
+        # 📐 Reference profile next to the model for fast drift checks
+        save_reference_profile(best_profile, reference_profile_path(save_path))
+
     # 📌 Register best model in MLflow Model Registry
     compare_and_register_models(run_metrics_dict, model_name_prefix="BestSalaryModel")
 
@@ -1,17 +1,15 @@
 import pandas as pd
 
-def clean_categorical_typos(df):
-    job_title_mapping = {
-        'data scntist': 'data scientist',
-        'data scienist': 'data scientist',
-        'dt scientist': 'data scientist',
-        'ml engr': 'ml engineer',
-        'ml enginer': 'ml engineer',
-        'machine learning engr': 'ml engineer',
-        'software engr': 'software engineer',
-        'softwre engineer': 'software engineer',
-        'sofware engneer': 'software engineer'
-    }
+from preprocessing.category_normalizer import CategoryNormalizer
 
-    df['job_title'] = df['job_title'].str.lower().str.strip().replace(job_title_mapping)
-    return df
+def clean_categorical_typos(df, normalizer=None):
+    """
+    Normalizes job_title spellings (known typos plus fuzzy-matched variants).
+
+    Parameters:
+        df (pd.DataFrame): Data to clean
+        normalizer (CategoryNormalizer): Fitted normalizer to apply (default: fit one on `df`)
+    """
+    if normalizer is None:
+        return CategoryNormalizer(columns=['job_title']).fit_transform(df)
+    return normalizer.transform(df)
@@ -0,0 +1,190 @@
+import difflib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cache.dataset_cache import atomic_write_json
+
+# Canonical spellings per normalized column. Values seen often enough during `fit`
+# are added to the vocabulary automatically.
+DEFAULT_VOCABULARY = {
+    "job_title": ["data scientist", "ml engineer", "software engineer"],
+}
+
+# Known typos that fuzzy matching alone would not resolve (abbreviations, word swaps)
+SEED_MAPPINGS = {
+    "job_title": {
+        "data scntist": "data scientist",
+        "data scienist": "data scientist",
+        "dt scientist": "data scientist",
+        "ml engr": "ml engineer",
+        "ml enginer": "ml engineer",
+        "machine learning engr": "ml engineer",
+        "software engr": "software engineer",
+        "softwre engineer": "software engineer",
+        "sofware engneer": "software engineer",
+    },
+}
+
+MAX_RESOLVED = 10_000  # Memoized fuzzy lookups per column (serving input is unbounded)
+
+
+def clean_text(value):
+    """
+    Lower-cases, strips and collapses whitespace; non-strings are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    return " ".join(value.lower().split())
+
+
+class CategoryNormalizer:
+    """
+    Normalizes spelling variants of categorical values (e.g. job_title typos).
+
+    Work is done on the unique values of each column, not on every row: each
+    distinct value is cleaned, resolved through the learned mappings or fuzzy
+    matched (difflib) against the canonical vocabulary, and the result is mapped
+    back to the rows through category codes. Output columns are `category`.
+
+    Parameters:
+        columns (list): Columns to normalize (default: the DEFAULT_VOCABULARY keys)
+        vocabulary (dict): Column -> canonical values (default: DEFAULT_VOCABULARY)
+        mappings (dict): Column -> {cleaned value: canonical value} seeds (default: SEED_MAPPINGS)
+        cutoff (float): Minimum difflib similarity ratio for a fuzzy match
+        min_frequency (float): Share of rows above which a value joins the vocabulary in `fit`
+    """
+
+    def __init__(self, columns=None, vocabulary=None, mappings=None, cutoff=0.85, min_frequency=0.01):
+        self.vocabulary = DEFAULT_VOCABULARY if vocabulary is None else vocabulary
+        self.columns = list(columns) if columns is not None else list(self.vocabulary)
+        self.cutoff = cutoff
+        self.min_frequency = min_frequency
+
+        seeds = SEED_MAPPINGS if mappings is None else mappings
+        self.vocabulary_ = {col: sorted(set(self.vocabulary.get(col, []))) for col in self.columns}
+        self.mappings_ = {col: dict(seeds.get(col, {})) for col in self.columns}
+        self._resolved = {col: OrderedDict() for col in self.columns}  # LRU memo of fuzzy lookups
+        self._lock = threading.Lock()
+
+    # ---------------------------- Fitting ----------------------------
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Learns the vocabulary (frequent values) and the mappings of rare variants.
+        """
+        for col in self.columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = self._codes(df[col])
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+            # Counts per cleaned value (several raw spellings can clean to the same value)
+            cleaned = pd.Series(counts, index=[clean_text(u) for u in uniques]).groupby(level=0).sum()
+            threshold = self.min_frequency * max(int(counts.sum()), 1)
+
+            # Every frequent value is a category of its own, however close its spelling is to
+            # another one ("dl engineer" vs "ml engineer"); only rare values are fuzzy matched
+            mapping = self.mappings_[col]
+            vocabulary = [v for v in self.vocabulary_[col] if v not in mapping]
+            candidates = [(value, count) for value, count in cleaned.items()
+                          if isinstance(value, str) and value not in mapping and value not in vocabulary]
+            vocabulary += [value for value, count in candidates if count >= threshold]
+            for value, count in candidates:
+                if count < threshold:
+                    match = difflib.get_close_matches(value, vocabulary, n=1, cutoff=self.cutoff)
+                    if match:
+                        mapping[value] = match[0]
+            self.vocabulary_[col] = sorted(vocabulary)
+            self._resolved[col] = OrderedDict()
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    # ---------------------------- Transforming ----------------------------
+
+    def resolve(self, col, value):
+        """
+        Returns the canonical form of one raw value of `col`.
+        """
+        value = clean_text(value)
+        if not isinstance(value, str):
+            return value
+        mapped = self.mappings_[col].get(value)
+        if mapped is not None:
+            return mapped
+        memo = self._resolved[col]
+        with self._lock:
+            if value in memo:
+                memo.move_to_end(value)
+                return memo[value]
+        # Unseen at fit time (e.g. at serving): fuzzy match, memoized (bounded) but not persisted
+        match = difflib.get_close_matches(value, self.vocabulary_[col], n=1, cutoff=self.cutoff)
+        resolved = match[0] if match else value
+        with self._lock:
+            memo[value] = resolved
+            if len(memo) > MAX_RESOLVED:
+                memo.popitem(last=False)
+        return resolved
+
+    @staticmethod
+    def _codes(series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+        return pd.factorize(series)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replaces each configured column with its normalized categorical version.
+        """
+        for col in self.columns:
+            if col not in df.columns:
+                continue
+            codes, uniques = self._codes(df[col])
+            resolved = [self.resolve(col, u) for u in uniques]
+            categories = pd.Index(pd.unique(pd.Series(resolved, dtype=object)))
+            remap = categories.get_indexer(resolved)
+            new_codes = np.full(len(codes), -1, dtype=np.int64)
+            known = codes >= 0
+            new_codes[known] = remap[codes[known]]
+            df[col] = pd.Categorical.from_codes(new_codes, categories=categories)
+        return df
+
+    def normalize_record(self, record: dict) -> dict:
+        """
+        Normalizes a single record (serving path) without building a DataFrame.
+        """
+        record = dict(record)
+        for col in self.columns:
+            if col in record:
+                record[col] = self.resolve(col, record[col])
+        return record
+
+    # ---------------------------- Persistence ----------------------------
+
+    def save(self, path: str):
+        payload = {
+            "columns": self.columns,
+            "cutoff": self.cutoff,
+            "min_frequency": self.min_frequency,
+            "vocabulary": self.vocabulary_,
+            "mappings": self.mappings_,
+        }
+        atomic_write_json(path, payload, indent=2, sort_keys=True)
+        print(f"💾 Saved category mappings: {path}")
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            payload = json.load(f)
+        return cls(
+            columns=payload["columns"],
+            vocabulary=payload["vocabulary"],
+            mappings=payload["mappings"],
+            cutoff=payload["cutoff"],
+            min_frequency=payload["min_frequency"],
+        )
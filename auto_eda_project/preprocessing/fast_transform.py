@@ -0,0 +1,271 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import Pipeline
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+
+from preprocessing.preprocessing import Winsorizer
+
+# Compile the fitted ColumnTransformer from `get_preprocessor` into plain NumPy ops
+# for low-latency (single-row) scoring without DataFrame construction.
+
+FAST_PREPROCESSOR_ARTIFACT = "fast_preprocessor.pkl"  # MLflow run artifact of the registered model
+VALIDATION_SAMPLE_ROWS = 200
+
+
+def fast_preprocessor_path(model_path: str) -> str:
+    """
+    Returns where the exported fast preprocessor of a saved model lives.
+    """
+    return os.path.splitext(model_path)[0] + "_fast_preprocessor.pkl"
+
+
+class PreprocessorCompileError(Exception):
+    """Raised when a fitted preprocessor cannot be compiled or fails validation."""
+    pass
+
+
+class FastPreprocessor:
+    """
+    NumPy-only equivalent of a fitted `get_preprocessor` ColumnTransformer.
+
+    Numeric branch: median imputation -> clipping to winsorizer bounds -> X * scale + offset.
+    Categorical branch: most-frequent imputation -> category -> output column lookup.
+
+    Accepts a dict (one record), a list of dicts, a DataFrame or a structured array.
+    Returns CSR when the compiled transformer had sparse output: estimators such as
+    XGBoost treat the zeros a CSR matrix leaves out as missing values, so a model
+    trained on CSR must be scored on CSR.
+    """
+
+    sparse_output = False  # Class default for instances pickled before the attribute existed
+
+    def __init__(self, num_cols, medians, lower, upper, scale, offset, scaler_clip,
+                 cat_cols, cat_fill, cat_index, n_output, sparse_output=False):
+        self.num_cols = list(num_cols)
+        self.medians = medians
+        self.lower = lower
+        self.upper = upper
+        self.scale = scale
+        self.offset = offset
+        self.scaler_clip = scaler_clip
+        self.cat_cols = list(cat_cols)
+        self.cat_fill = cat_fill      # Imputed value per categorical column
+        self.cat_index = cat_index    # Per column: {category: output column index}
+        self.n_output = n_output
+        self.sparse_output = sparse_output
+
+    @staticmethod
+    def _column_getter(X):
+        # Returns (column name -> 1-D sequence of raw values, number of rows)
+        if isinstance(X, dict):
+            return (lambda col: [X.get(col, np.nan)]), 1
+        if isinstance(X, pd.DataFrame):
+            return (lambda col: X[col].to_numpy() if col in X.columns else np.full(len(X), np.nan)), len(X)
+        if isinstance(X, np.ndarray) and X.dtype.names:
+            return (lambda col: X[col] if col in X.dtype.names else np.full(len(X), np.nan)), len(X)
+        records = list(X)
+        return (lambda col: [r.get(col, np.nan) for r in records]), len(records)
+
+    def transform(self, X):
+        get, n_rows = self._column_getter(X)
+        out = np.zeros((n_rows, self.n_output), dtype=np.float64)
+
+        # 🔹 Numeric block
+        if self.num_cols:
+            num = np.empty((n_rows, len(self.num_cols)), dtype=np.float64)
+            for j, col in enumerate(self.num_cols):
+                num[:, j] = np.asarray(get(col), dtype=np.float64)
+            num = np.where(np.isnan(num), self.medians, num)
+            if self.lower is not None:
+                np.clip(num, self.lower, self.upper, out=num)
+            num *= self.scale
+            num += self.offset
+            if self.scaler_clip:
+                np.clip(num, 0.0, 1.0, out=num)
+            out[:, :len(self.num_cols)] = num
+
+        # 🔹 Categorical block (one-hot via dict lookup, unknown -> all zeros)
+        rows = np.arange(n_rows)
+        for col, fill, index in zip(self.cat_cols, self.cat_fill, self.cat_index):
+            values = get(col)
+            idx = np.fromiter(
+                (index.get(fill if (isinstance(v, float) and v != v) else v, -1) for v in values),
+                dtype=np.int64, count=n_rows,
+            )
+            known = idx >= 0
+            out[rows[known], idx[known]] = 1.0
+
+        return sparse.csr_matrix(out) if self.sparse_output else out
+
+
+def _unwrap_pipeline(transformer):
+    steps = transformer.steps if isinstance(transformer, Pipeline) else [(None, transformer)]
+    return [step for _, step in steps if step not in (None, "passthrough")]
+
+
+def _kept_columns(imputer, cols):
+    # SimpleImputer drops all-missing columns (statistics_ is NaN) unless keep_empty_features
+    if getattr(imputer, "keep_empty_features", False):
+        return list(cols), imputer.statistics_
+    keep = ~pd.isna(imputer.statistics_)
+    return [c for c, k in zip(cols, keep) if k], imputer.statistics_[keep]
+
+
+def compile_preprocessor(preprocessor) -> FastPreprocessor:
+    """
+    Compiles a fitted `get_preprocessor` ColumnTransformer into a FastPreprocessor.
+
+    Raises:
+        PreprocessorCompileError: If the transformer layout is not supported.
+    """
+    num_spec, cat_spec = None, None
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "remainder" or transformer == "drop" or len(cols) == 0:
+            continue
+        if name == "num":
+            num_spec = (_unwrap_pipeline(transformer), list(cols))
+        elif name == "cat":
+            cat_spec = (_unwrap_pipeline(transformer), list(cols))
+        else:
+            raise PreprocessorCompileError(f"Unsupported transformer: {name}")
+
+    # 🔹 Numeric branch: SimpleImputer(median) -> Winsorizer -> MinMaxScaler
+    num_cols, medians, lower, upper = [], None, None, None
+    scale, offset, scaler_clip = None, None, False
+    if num_spec:
+        steps, cols = num_spec
+        if [type(s) for s in steps] != [SimpleImputer, Winsorizer, MinMaxScaler]:
+            raise PreprocessorCompileError(f"Unsupported numeric pipeline: {steps}")
+        imputer, winsor, scaler = steps
+        num_cols, medians = _kept_columns(imputer, cols)
+        medians = medians.astype(np.float64)
+        # Bounds learned at fit time; without them the winsorizer is a no-op on single rows
+        lower, upper = getattr(winsor, "lower_", None), getattr(winsor, "upper_", None)
+        scale, offset, scaler_clip = scaler.scale_, scaler.min_, bool(getattr(scaler, "clip", False))
+
+    # 🔹 Categorical branch: SimpleImputer(most_frequent) -> OneHotEncoder
+    cat_cols, cat_fill, cat_index = [], [], []
+    position = len(num_cols)
+    if cat_spec:
+        steps, cols = cat_spec
+        if [type(s) for s in steps] != [SimpleImputer, OneHotEncoder]:
+            raise PreprocessorCompileError(f"Unsupported categorical pipeline: {steps}")
+        imputer, encoder = steps
+        if encoder.drop is not None:
+            raise PreprocessorCompileError("OneHotEncoder(drop=...) is not supported.")
+        cat_cols, fills = _kept_columns(imputer, cols)
+
+        infrequent = getattr(encoder, "infrequent_categories_", None) or [None] * len(encoder.categories_)
+        for fill, categories, rare in zip(fills, encoder.categories_, infrequent):
+            # Frequent categories keep their order; infrequent ones share one trailing column
+            rare = set(rare) if rare is not None else set()
+            frequent = [cat for cat in categories if cat not in rare]
+            index = {cat: position + i for i, cat in enumerate(frequent)}
+            index.update({cat: position + len(frequent) for cat in rare})
+            cat_fill.append(fill)
+            cat_index.append(index)
+            position += len(frequent) + (1 if rare else 0)
+
+    return FastPreprocessor(num_cols, medians, lower, upper, scale, offset, scaler_clip,
+                            cat_cols, cat_fill, cat_index, position,
+                            sparse_output=bool(getattr(preprocessor, "sparse_output_", False)))
+
+
+def build_probe_frame(fast: FastPreprocessor) -> pd.DataFrame:
+    """
+    Builds a data-free validation frame from the fitted parameters: every known
+    category once, plus rows with missing and unknown values.
+    """
+    base = {col: float(m) for col, m in zip(fast.num_cols, fast.medians)}
+    base.update({col: fill for col, fill in zip(fast.cat_cols, fast.cat_fill)})
+
+    rows = [dict(base)]
+    for col, index in zip(fast.cat_cols, fast.cat_index):
+        rows.extend({**base, col: cat} for cat in index)
+        rows.append({**base, col: np.nan})
+        rows.append({**base, col: "__unknown__"})
+    for col in fast.num_cols:
+        rows.append({**base, col: np.nan})
+        rows.append({**base, col: 0.0})
+    return pd.DataFrame(rows)
+
+
+def _dense(X):
+    return np.asarray(X.toarray() if sparse.issparse(X) else X, dtype=np.float64)
+
+
+def validate_equivalence(pipeline, fast: FastPreprocessor, df: pd.DataFrame) -> bool:
+    """
+    Checks that serving through the compiled transform gives exactly the pipeline's
+    predictions: the transformed values row by row (the single-record serving path),
+    the output format (dense vs CSR) and the regressor's predictions on all rows.
+    Equal transformed values alone are not enough, since the regressor may read a
+    dense zero and a CSR zero differently.
+    """
+    preprocessor = pipeline.named_steps["preprocessing"]
+    for i in range(len(df)):
+        row = df.iloc[[i]]
+        expected, got = preprocessor.transform(row), fast.transform(row)
+        if sparse.issparse(expected) != sparse.issparse(got) or not np.array_equal(_dense(expected), _dense(got)):
+            print(f"❌ Fast preprocessor mismatch on row {i}: {row.to_dict('records')[0]}")
+            return False
+
+    expected = pipeline.predict(df)
+    got = pipeline.named_steps["regressor"].predict(fast.transform(df))
+    if not np.array_equal(expected, got):
+        print(f"❌ Fast path predictions differ (max |diff| {np.max(np.abs(expected - got)):.6g})")
+        return False
+    return True
+
+
+def validate_fast_path(pipeline, fast: FastPreprocessor, sample_df: pd.DataFrame) -> bool:
+    """
+    The single gate for serving through a FastPreprocessor, used at export and at
+    load time: real sample rows plus the probe frame must give identical predictions.
+    """
+    probe = build_probe_frame(fast).reindex(columns=sample_df.columns)
+    return all(validate_equivalence(pipeline, fast, frame) for frame in (sample_df, probe))
+
+
+def export_fast_preprocessor(pipeline, sample_df: pd.DataFrame, save_path: str,
+                             n_samples: int = VALIDATION_SAMPLE_ROWS):
+    """
+    Compiles the `preprocessing` step of a fitted pipeline, validates it with
+    `validate_fast_path` on sample rows, and saves it with joblib. The sample rows
+    are saved with it, so servers re-run the same check against the model they load.
+
+    Returns:
+        FastPreprocessor: The validated compiled preprocessor.
+    """
+    fast = compile_preprocessor(pipeline.named_steps["preprocessing"])
+
+    sample = sample_df.sample(min(n_samples, len(sample_df)), random_state=42)
+    if not validate_fast_path(pipeline, fast, sample):
+        raise PreprocessorCompileError("Compiled preprocessor is not equivalent to the sklearn path.")
+
+    fast.validation_sample = sample.reset_index(drop=True)
+    joblib.dump(fast, save_path)
+    print(f"⚡ Exported validated fast preprocessor: {save_path}")
+    return fast
+
+
+def load_fast_preprocessor(path: str, pipeline):
+    """
+    Loads an exported fast preprocessor and re-validates it against `pipeline` on its
+    saved sample rows.
+
+    Raises:
+        PreprocessorCompileError: If it has no sample rows (older exports) or fails validation.
+    """
+    fast = joblib.load(path)
+    sample = getattr(fast, "validation_sample", None)
+    if sample is None:
+        raise PreprocessorCompileError(f"No validation sample saved with {path}; re-export it.")
+    if not validate_fast_path(pipeline, fast, sample):
+        raise PreprocessorCompileError(f"{path} is not equivalent to the loaded model.")
+    return fast
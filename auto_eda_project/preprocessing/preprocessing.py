@@ -1,31 +1,21 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.base import BaseEstimator, OneToOneFeatureMixin, TransformerMixin
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, MinMaxScaler
 from sklearn.impute import SimpleImputer
+import scipy.sparse as sp
 from scipy.stats.mstats import winsorize
 
+from preprocessing.category_normalizer import CategoryNormalizer
+
 #  Clean categorical typos (e.g., job_title)
 
 def clean_categorical_typos(df):
-    job_title_map = {
-        'data scntist': 'data scientist',
-        'data scienist': 'data scientist',
-        'dt scientist': 'data scientist',
-        'ml engr': 'ml engineer',
-        'ml enginer': 'ml engineer',
-        'machine learning engr': 'ml engineer',
-        'software engr': 'software engineer',
-        'softwre engineer': 'software engineer',
-        'sofware engneer': 'software engineer'
-    }
-
-    if 'job_title' in df.columns:
-        df['job_title'] = df['job_title'].str.lower().str.strip().replace(job_title_map)
-    return df
+    # Delegates to the shared normalization engine (see preprocessing/category_normalizer.py)
+    return CategoryNormalizer(columns=['job_title']).fit_transform(df)
 
 # Drop fully missing columns (e.g., all NaN cols)
 
@@ -36,23 +26,81 @@ def drop_fully_missing_columns(df):
 #  Log transform the target for skew handling
 
 def log_transform_target(y):
-    return np.log1p(y)
+    return np.log1p(y.astype(np.float64))  # Loaders may downcast the target to float32/int
+
+
+#  Undo the loader's float32 downcast before fitting
+
+def restore_float64(X):
+    # optimize_frame_dtypes stores exactly representable floats as float32. sklearn keeps
+    # float32 through the numeric branch, while served records are float64, so models are
+    # fit (and the fast path validated) on float64 like at inference time.
+    float32_cols = X.select_dtypes(include='float32').columns
+    return X.astype({col: np.float64 for col in float32_cols}) if len(float32_cols) else X
 
 # Custom Winsorizer for outlier treatment
 
-class Winsorizer(BaseEstimator, TransformerMixin):
-    def __init__(self, limits=(0.05, 0.05)):
+class Winsorizer(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """
+    Clips each column to the bounds `scipy.stats.mstats.winsorize` would use on the
+    training data. Bounds are learned once in `fit` (one column at a time, so memory
+    stays bounded on large matrices) and applied with a single vectorized `np.clip`,
+    so transforms no longer depend on the batch being scored.
+
+    Parameters:
+        limits (tuple): Fraction of values clipped at the (lower, upper) end
+        copy (bool): If False, clip float inputs in place when possible
+    """
+    def __init__(self, limits=(0.05, 0.05), copy=True):
         self.limits = limits
-        self.columns = None
+        self.copy = copy
+
+    def __setstate__(self, state):
+        # Pickles from before `copy` existed: default it so get_params/clone/repr work
+        state.setdefault("copy", True)
+        super().__setstate__(state)
+
+    def _to_float_array(self, X, copy):
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy()
+        X = np.asarray(X)
+        if X.dtype not in (np.float32, np.float64):
+            return X.astype(np.float64)  # Always a fresh array
+        if copy or not X.flags.writeable:
+            return X.copy()
+        return X
 
     def fit(self, X, y=None):
         if isinstance(X, pd.DataFrame):
-            self.columns = X.columns
-        else:
-            self.columns = [f"feature_{i}" for i in range(X.shape[1])]
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = self._to_float_array(X, copy=False)
+        self.n_features_in_ = X.shape[1]
+
+        lower_limit, upper_limit = (limit or 0.0 for limit in self.limits)
+        self.lower_ = np.full(X.shape[1], -np.inf)
+        self.upper_ = np.full(X.shape[1], np.inf)
+        for j in range(X.shape[1]):
+            col = X[:, j]
+            col = col[~np.isnan(col)]
+            n = len(col)
+            if n == 0:
+                continue
+            # Same order statistics as scipy's winsorize
+            lo = int(lower_limit * n)
+            hi = n - int(upper_limit * n) - 1
+            part = np.partition(col, [lo, hi])
+            self.lower_[j], self.upper_[j] = part[lo], part[hi]
         return self
 
     def transform(self, X):
+        if not hasattr(self, "lower_"):
+            return self._legacy_transform(X)
+
+        X = self._to_float_array(X, copy=self.copy)
+        return np.clip(X, self.lower_.astype(X.dtype), self.upper_.astype(X.dtype), out=X)
+
+    def _legacy_transform(self, X):
+        # Models pickled before bounds were learned at fit time: per-batch winsorizing
         if isinstance(X, np.ndarray):
             X = pd.DataFrame(X, columns=self.columns)
         X_winsorized = X.copy()
@@ -62,14 +110,23 @@ class Winsorizer(BaseEstimator, TransformerMixin):
 
 #  Get Preprocessing Pipeline (based on current dataset)
 
-def get_preprocessor(df):
+def get_preprocessor(df, sparse=False, min_frequency=None, max_categories=None):
+    """
+    Builds the ColumnTransformer for the current dataset.
+
+    Parameters:
+        df (pd.DataFrame): Raw dataset (used to infer column types)
+        sparse (bool): Keep the one-hot output (and the combined matrix) in CSR format
+        min_frequency (int|float): Group categories rarer than this into one "infrequent" column
+        max_categories (int): Cap on output columns per categorical feature
+    """
     # Drop irrelevant or leakage columns (if any exist)
     drop_cols = ['education', 'skills', 'company_location', 'salary_currency']
     df = df.drop(columns=[col for col in drop_cols if col in df.columns], errors='ignore')
 
     # Identify feature types
     num_cols = df.select_dtypes(include='number').columns.tolist()
-    cat_cols = df.select_dtypes(include='object').columns.tolist()
+    cat_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
 
     # Remove target from numerical columns
     target = 'adjusted_total_usd'
@@ -79,21 +136,44 @@ def get_preprocessor(df):
     # Numerical pipeline
     num_pipeline = Pipeline(steps=[
         ('num_imputer', SimpleImputer(strategy='median')),
-        ('winsor', Winsorizer()),
+        ('winsor', Winsorizer(copy=False)),  # Imputer output is a fresh array
         ('scaler', MinMaxScaler())
     ])
 
     # Categorical pipeline
     cat_pipeline = Pipeline(steps=[
         ('cat_imputer', SimpleImputer(strategy='most_frequent')),
-        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=sparse,
+                                 min_frequency=min_frequency, max_categories=max_categories))
     ])
 
-    # Combined ColumnTransformer
+    # Combined ColumnTransformer (sparse_threshold=1.0 keeps the stacked output CSR in sparse mode)
     preprocessor = ColumnTransformer(transformers=[
         ('num', num_pipeline, num_cols),
         ('cat', cat_pipeline, cat_cols)
-    ])
+    ], sparse_threshold=1.0 if sparse else 0.3)
 
     return preprocessor
 
+
+#  Report memory of a transformed feature matrix (sparse vs dense float64)
+
+def feature_matrix_memory(X):
+    """
+    Returns the memory used by a transformed feature matrix and what the same
+    matrix would take as a dense float64 array.
+    """
+    n_rows, n_cols = X.shape
+    dense_mb = n_rows * n_cols * 8 / 1024 ** 2
+    if sp.issparse(X):
+        actual_mb = (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024 ** 2
+    else:
+        actual_mb = X.nbytes / 1024 ** 2
+
+    return {
+        "shape": (n_rows, n_cols),
+        "sparse": sp.issparse(X),
+        "memory_mb": round(actual_mb, 2),
+        "dense_memory_mb": round(dense_mb, 2),
+        "saved_mb": round(dense_mb - actual_mb, 2),
+    }
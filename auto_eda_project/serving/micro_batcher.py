@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+
+class MicroBatcher:
+    """
+    Coalesces single-record prediction requests into vectorized predict calls.
+
+    Callers submit one record (dict) at a time and get a Future back. A background
+    worker drains the shared queue into batches of up to `max_batch_size` records,
+    waiting at most `max_wait_ms` after the first record arrives, and runs
+    `predict_fn` once per batch.
+
+    Parameters:
+        predict_fn: Callable taking a DataFrame and returning one prediction per row
+        max_batch_size (int): Maximum number of records per predict call
+        max_wait_ms (float): Maximum time to wait for a batch to fill up
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        # Started lazily so that pre-forked servers (gunicorn) get one worker thread per process
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                    self._worker.start()
+
+    def submit(self, record: dict) -> Future:
+        """
+        Queues a single record for scoring and returns a Future for its prediction.
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def predict(self, record: dict, timeout: float = None):
+        """
+        Blocking helper: submits a record and waits for its prediction.
+        """
+        return self.submit(record).result(timeout=timeout)
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]  # Block until the first record arrives
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            records = [record for record, _ in batch]
+            futures = [future for _, future in batch]
+
+            try:
+                preds = self.predict_fn(pd.DataFrame(records))
+            except Exception:
+                # One malformed record must not fail the whole batch: retry record by record
+                self._predict_individually(records, futures)
+                continue
+
+            for future, pred in zip(futures, preds):
+                future.set_result(pred)
+
+    def _predict_individually(self, records, futures):
+        for record, future in zip(records, futures):
+            try:
+                future.set_result(self.predict_fn(pd.DataFrame([record]))[0])
+            except Exception as e:
+                future.set_exception(e)
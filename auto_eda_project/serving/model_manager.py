@@ -0,0 +1,245 @@
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+
+from preprocessing.fast_transform import FAST_PREPROCESSOR_ARTIFACT, fast_preprocessor_path, load_fast_preprocessor
+from model.model_io import load_model_artifact
+from evidently_ai.reference_profile import REFERENCE_PROFILE_ARTIFACT, load_reference_profile, reference_profile_path
+
+# reference_profile: training-data profile of this version for drift monitoring (None if unavailable)
+LoadedModel = namedtuple("LoadedModel", ["version", "model", "fast_preprocessor", "reference_profile"],
+                         defaults=(None,))
+
+LOCAL_VERSION = "local"
+
+
+class ModelManager:
+    """
+    Keeps the serving model in sync with the MLflow Model Registry without restarts.
+
+    The latest version registered under `<model_name_prefix>_*` (the names used by
+    `compare_and_register_models`) is downloaded into a local artifact cache, loaded
+    in a background thread and swapped in atomically. Requests grab `current()` once
+    and keep that model for their whole lifetime, so a swap never drops in-flight work.
+    The last `keep_versions` models stay loaded for instant rollback. Each loaded
+    pipeline also gets the FastPreprocessor exported at train time, re-validated on
+    its saved sample rows (None if missing or not equivalent), and the reference
+    profile of its training data. Both come from the version's MLflow run, or sit
+    next to the fallback .pkl.
+
+    Parameters:
+        model_name_prefix (str): Registry name prefix (e.g. "BestSalaryModel")
+        cache_dir (str): Local directory for downloaded model artifacts
+        fallback_path (str): Local .pkl used when the registry is unavailable
+        poll_interval_s (float): Seconds between registry checks
+        keep_versions (int): Number of loaded versions kept warm
+    """
+
+    def __init__(self, model_name_prefix="BestSalaryModel", cache_dir="model_cache",
+                 fallback_path=None, poll_interval_s=60.0, keep_versions=3):
+        self.model_name_prefix = model_name_prefix
+        self.cache_dir = cache_dir
+        self.fallback_path = fallback_path
+        self.poll_interval_s = poll_interval_s
+        self.keep_versions = keep_versions
+
+        self._current = None
+        self._latest_seen = None  # Newest registry version already activated once
+        self._warm = OrderedDict()  # version -> LoadedModel, most recent last
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller = None
+
+    # ---------------------------- Public API ----------------------------
+
+    def start(self, poll=True):
+        """
+        Loads the initial model synchronously, then starts the background poller.
+
+        Parameters:
+            poll (bool): Start the poller now. Pre-forking servers load the model in
+                the master with poll=False and call `start_poller()` in each worker
+                (threads do not survive fork).
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️ Model registry unavailable ({e}), falling back to local model.")
+
+        if self._current is None:
+            self._load_fallback()
+
+        if poll:
+            self.start_poller()
+        return self
+
+    def start_poller(self):
+        if self.poll_interval_s and (self._poller is None or not self._poller.is_alive()):
+            self._poller = threading.Thread(target=self._poll, name="model-poller", daemon=True)
+            self._poller.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def current(self) -> LoadedModel:
+        """
+        Returns the active (version, model, fast_preprocessor). Callers should hold
+        on to the returned object for the duration of a request.
+        """
+        if self._current is None:
+            raise RuntimeError("No model loaded. Call ModelManager.start() first.")
+        return self._current
+
+    def refresh(self) -> bool:
+        """
+        Resolves the latest registered version and swaps it in if it is new.
+
+        Returns:
+            bool: True if a new version was activated
+        """
+        latest = self._resolve_latest_version()
+        if latest is None:
+            return False
+
+        name, version = latest
+        key = f"{name}/{version}"
+        if key == self._latest_seen:
+            return False  # Nothing new (also keeps a manual rollback in place)
+
+        with self._lock:
+            loaded = self._warm.get(key)
+        if loaded is None:
+            loaded = self._prepare(key, *self._load_registered(name, version))
+
+        self._activate(loaded)
+        self._latest_seen = key
+        print(f"🔄 Serving model version: {key}")
+        return True
+
+    def rollback(self, version=None) -> LoadedModel:
+        """
+        Switches back to a warm version (default: the one before the current).
+        The rollback holds until a newer version is registered.
+        """
+        with self._lock:
+            warm_versions = list(self._warm)
+            if version is None:
+                if len(warm_versions) < 2:
+                    raise ValueError("No previous model version available for rollback.")
+                version = warm_versions[-2]
+            if version not in self._warm:
+                raise ValueError(f"Model version not warm: {version}. Available: {warm_versions}")
+            loaded = self._warm[version]
+
+        self._activate(loaded)
+        print(f"⏪ Rolled back to model version: {version}")
+        return self._current
+
+    def versions(self):
+        """
+        Returns the warm versions, oldest first.
+        """
+        with self._lock:
+            return list(self._warm)
+
+    # ---------------------------- Internals ----------------------------
+
+    def _prepare(self, key, model, profile_path=None, fast_path=None) -> LoadedModel:
+        # Low-latency preprocessing path, under the same check as at export; serve through sklearn otherwise
+        fast = None
+        if fast_path and os.path.exists(fast_path):
+            try:
+                fast = load_fast_preprocessor(fast_path, model)
+            except Exception as e:
+                print(f"⚠️ Fast preprocessing unavailable for {key}: {e}")
+
+        profile = None
+        if profile_path and os.path.exists(profile_path):
+            try:
+                profile = load_reference_profile(profile_path)
+            except Exception as e:
+                print(f"⚠️ Reference profile unavailable for {key}: {e}")
+        return LoadedModel(key, model, fast, profile)
+
+    def _activate(self, loaded: LoadedModel):
+        with self._lock:
+            self._warm[loaded.version] = loaded
+            self._warm.move_to_end(loaded.version)
+            while len(self._warm) > self.keep_versions:
+                self._warm.popitem(last=False)
+            # Single reference assignment: readers see either the old or the new model
+            self._current = loaded
+
+    def _resolve_latest_version(self):
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        latest = None
+        for registered in client.search_registered_models(filter_string=f"name LIKE '{self.model_name_prefix}_%'"):
+            for mv in client.search_model_versions(f"name='{registered.name}'"):
+                if latest is None or int(mv.creation_timestamp) > int(latest.creation_timestamp):
+                    latest = mv
+        if latest is None:
+            return None
+        return latest.name, str(latest.version)
+
+    def _load_registered(self, name, version):
+        import mlflow
+        import mlflow.sklearn
+
+        local_dir = os.path.join(self.cache_dir, name, version)
+        if not os.path.exists(local_dir):
+            os.makedirs(os.path.dirname(local_dir), exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(local_dir))
+            try:
+                downloaded = mlflow.artifacts.download_artifacts(
+                    artifact_uri=f"models:/{name}/{version}", dst_path=tmp_dir
+                )
+                os.replace(downloaded, local_dir)  # Atomic publish into the cache
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            print(f"📥 Cached model artifact: {local_dir}")
+
+        return (mlflow.sklearn.load_model(local_dir),
+                self._download_run_artifact(name, version, local_dir, REFERENCE_PROFILE_ARTIFACT),
+                self._download_run_artifact(name, version, local_dir, FAST_PREPROCESSOR_ARTIFACT))
+
+    def _download_run_artifact(self, name, version, local_dir, artifact_file):
+        # Reference profile / fast preprocessor: run artifacts next to the logged model (older runs have none)
+        import mlflow
+        from mlflow.tracking import MlflowClient
+
+        path = os.path.join(local_dir, artifact_file)
+        if os.path.exists(path):
+            return path
+        tmp_dir = tempfile.mkdtemp(dir=local_dir)
+        try:
+            run_id = MlflowClient().get_model_version(name, version).run_id
+            downloaded = mlflow.artifacts.download_artifacts(
+                artifact_uri=f"runs:/{run_id}/{artifact_file}", dst_path=tmp_dir
+            )
+            os.replace(downloaded, path)
+            return path
+        except Exception as e:
+            print(f"⚠️ No {artifact_file} for {name}/{version}: {e}")
+            return None
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _load_fallback(self):
+        if not self.fallback_path or not os.path.exists(self.fallback_path):
+            raise FileNotFoundError(f"🚫 Model not found at: {self.fallback_path}")
+        self._activate(self._prepare(LOCAL_VERSION, load_model_artifact(self.fallback_path),
+                                     reference_profile_path(self.fallback_path),
+                                     fast_preprocessor_path(self.fallback_path)))
+        print(f"📦 Serving local model: {self.fallback_path}")
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval_s):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Model refresh failed, keeping current version: {e}")
@@ -0,0 +1,216 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from evidently_ai.reference_profile import DRIFT_SHARE, as_report_dict, bin_numeric, score_histogram
+
+PREDICTION_KEY = "__prediction__"
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class OnlineDriftMonitor:
+    """
+    Tracks the distribution of live traffic against the training reference profile.
+
+    Every profiled feature (and the predictions, against the model's own holdout
+    predictions stored in the profile) gets a ring of per-time-bucket histograms over the profile's bins: `window_s`
+    seconds split into `n_buckets` buckets. An update only adds counts to the
+    current bucket and a stale bucket is zeroed when it is reused, so memory is
+    fixed and no raw rows are kept. `snapshot()` sums the live buckets and scores
+    them with the same PSI / KS / chi-square / Jensen-Shannon rules as offline checks.
+
+    Parameters:
+        profile (dict): Reference profile (see evidently_ai.reference_profile)
+        window_s (float): Sliding window length in seconds
+        n_buckets (int): Time buckets per window (window granularity)
+        flush_interval_s (float): Seconds between MLflow snapshots (None = never)
+        experiment_name (str): MLflow experiment for the snapshots
+    """
+
+    def __init__(self, profile, window_s=3600.0, n_buckets=12,
+                 flush_interval_s=300.0, experiment_name="Online Drift Monitoring"):
+        self.profile = profile
+        self.window_s = window_s
+        self.n_buckets = n_buckets
+        self.bucket_s = window_s / n_buckets
+        self.flush_interval_s = flush_interval_s
+        self.experiment_name = experiment_name
+
+        self._refs = {col: ref for col, ref in profile["columns"].items() if ref["count"] > 0}
+        if profile.get("prediction", {}).get("count", 0) > 0:
+            self._refs[PREDICTION_KEY] = profile["prediction"]
+        self._category_index = {
+            col: {category: i for i, category in enumerate(ref["categories"])}
+            for col, ref in self._refs.items() if ref["kind"] == "categorical"
+        }
+
+        # Per column: (n_buckets, n_bins) counts + per-bucket missing counts
+        self._counts = {col: np.zeros((n_buckets, len(ref["proportions"])), dtype=np.int64)
+                        for col, ref in self._refs.items()}
+        self._missing = {col: np.zeros(n_buckets, dtype=np.int64) for col in self._refs}
+        self._bucket_ids = np.full(n_buckets, -1, dtype=np.int64)  # Absolute bucket number per slot
+        self._rows = np.zeros(n_buckets, dtype=np.int64)
+
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+        self._run_id = None
+        self._flushes = 0
+
+    # ---------------------------- Updates ----------------------------
+
+    def _slot(self, now):
+        # Returns the ring slot of the current bucket, clearing it if it holds an older bucket
+        bucket = int(now // self.bucket_s)
+        slot = bucket % self.n_buckets
+        if self._bucket_ids[slot] != bucket:
+            self._bucket_ids[slot] = bucket
+            self._rows[slot] = 0
+            for col in self._counts:
+                self._counts[col][slot] = 0
+                self._missing[col][slot] = 0
+        return slot
+
+    def _bin(self, col, values):
+        # values: an array / Series (vectorized path for chunks) or a short list from JSON records
+        ref = self._refs[col]
+        if ref["kind"] == "numeric":
+            if isinstance(values, np.ndarray):
+                numeric = values
+            elif isinstance(values, pd.Series):
+                numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                numeric = np.array([_to_float(value) for value in values], dtype=np.float64)
+            return bin_numeric(ref, numeric), int(np.isnan(numeric).sum())
+
+        index, other = self._category_index[col], len(ref["categories"])
+        counts = np.zeros(other + 1, dtype=np.int64)
+        if isinstance(values, pd.Series):
+            frequencies = values.value_counts(dropna=True)
+            positions = [index.get(str(value), other) for value in frequencies.index]
+            np.add.at(counts, positions, frequencies.to_numpy())
+            return counts, int(values.isna().sum())
+
+        missing = 0
+        for value in values:
+            if pd.isna(value):
+                missing += 1
+            else:
+                counts[index.get(str(value), other)] += 1
+        return counts, missing
+
+    def update(self, rows, predictions=None):
+        """
+        Adds one request's rows (DataFrame or list of records) and optional predictions.
+        """
+        n_rows = len(rows)
+        if isinstance(rows, pd.DataFrame):
+            columns = {col: rows[col] for col in self._refs if col in rows.columns}
+        else:
+            columns = {col: [record.get(col) for record in rows] for col in self._refs
+                       if any(col in record for record in rows)}
+        if predictions is not None:
+            columns[PREDICTION_KEY] = np.asarray(predictions, dtype=np.float64).ravel()
+
+        binned = {col: self._bin(col, values) for col, values in columns.items()}  # Outside the lock
+
+        self._ensure_flusher()
+        with self._lock:
+            slot = self._slot(time.time())
+            self._rows[slot] += n_rows
+            for col, (counts, missing) in binned.items():
+                self._counts[col][slot] += counts
+                self._missing[col][slot] += missing
+
+    # ---------------------------- Metrics ----------------------------
+
+    def snapshot(self, drift_share=DRIFT_SHARE) -> dict:
+        """
+        Scores the current window against the reference profile.
+
+        Returns:
+            dict: Same layout as `score_drift` (predictions under "prediction"),
+            plus the window bounds
+        """
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            live = self._bucket_ids > int(now // self.bucket_s) - self.n_buckets
+            rows = int(self._rows[live].sum())
+            counts = {col: c[live].sum(axis=0) for col, c in self._counts.items()}
+            missing = {col: int(m[live].sum()) for col, m in self._missing.items()}
+
+        column_metrics = {}
+        for col, observed in counts.items():
+            seen = int(observed.sum()) + missing[col]
+            if seen == 0:
+                continue
+            result = score_histogram(self._refs[col], observed)
+            result["missing_rate"] = missing[col] / seen
+            column_metrics["prediction" if col == PREDICTION_KEY else col] = result
+
+        features = {col: r for col, r in column_metrics.items() if col != "prediction"}
+        n_drifted = sum(bool(r["drifted"]) for r in features.values())
+        share = n_drifted / len(features) if features else 0.0
+        return {
+            "drift_detected": bool(features) and share >= drift_share,
+            "prediction_drift": bool(column_metrics.get("prediction", {}).get("drifted", False)),
+            "share_of_drifted_columns": share,
+            "number_of_drifted_columns": n_drifted,
+            "number_of_columns": len(features),
+            "n_rows": rows,
+            "window_s": self.window_s,
+            "window_start": now - self.window_s,
+            "window_end": now,
+            "score_seconds": time.perf_counter() - start,
+            "column_metrics": column_metrics,
+        }
+
+    # ---------------------------- MLflow flush ----------------------------
+
+    def flush(self):
+        """
+        Logs the current snapshot to MLflow (one run per monitor, one step per flush).
+        """
+        import mlflow
+
+        from auto_eda_project.mlflow.buffered_logger import get_logger
+        from evidently_ai.log_drift_metrics import log_evidently_metrics
+
+        snapshot = self.snapshot()
+        if snapshot["n_rows"] == 0:
+            return None
+
+        mlflow.set_experiment(self.experiment_name)
+        with get_logger().run(run_id=self._run_id, run_name=None if self._run_id else "Online_Drift"):
+            self._run_id = mlflow.active_run().info.run_id
+            log_evidently_metrics(as_report_dict(snapshot, "OnlineDrift"), prefix="online__", step=self._flushes)
+        self._flushes += 1
+        return snapshot
+
+    def _ensure_flusher(self):
+        # Started lazily so that pre-forked servers (gunicorn) get one flusher per process
+        if not self.flush_interval_s or (self._flusher is not None and self._flusher.is_alive()):
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name="drift-flusher", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval_s):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Drift snapshot flush failed: {e}")
+
+    def stop(self):
+        self._stop.set()
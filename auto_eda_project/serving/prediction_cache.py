@@ -0,0 +1,116 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_value(value):
+    """
+    Canonicalizes a feature value for use in a cache key.
+    Numbers compare equal regardless of type (3 == 3.0 == np.float32(3)) and every
+    flavour of missing value (None, NaN, pd.NA) collapses to None. Booleans are
+    tagged so that True and 1.0 get different keys.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return ("bool", bool(value))
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        return None if math.isnan(value) else value
+    try:
+        if value != value:  # NaN-like objects (pd.NA raises, handled below)
+            return None
+    except TypeError:
+        return None
+    return value
+
+
+def make_feature_key(record: dict, feature_names) -> tuple:
+    """
+    Builds a schema-ordered key from a record, mirroring the `align_features` step
+    (missing features default to 0). Returns None, i.e. not cacheable, when a
+    value is unhashable (a list or object sent as a feature).
+    """
+    key = tuple(normalize_value(record.get(name, 0)) for name in feature_names)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU + TTL cache of predictions keyed on normalized feature tuples.
+
+    Entries are keyed on (model version, features), so a model swap can never serve
+    stale predictions, and requests still pinned to the previous version during a
+    swap neither see nor evict the new version's entries. Entries of versions no
+    longer served age out through the LRU.
+
+    Parameters:
+        max_size (int): Maximum number of cached predictions
+        ttl_s (float): Time-to-live of an entry in seconds (None = no expiry)
+    """
+
+    def __init__(self, max_size=10_000, ttl_s=3600.0):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._entries = OrderedDict()  # (version, key) -> (prediction, expires_at)
+        self._version = None  # Latest version stored, for stats
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version_changes = 0
+
+    def get(self, key, version):
+        """
+        Returns the cached prediction for `key` under `version`, or None on a miss.
+        """
+        key = (version, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]  # Expired
+            self.misses += 1
+            return None
+
+    def put(self, key, version, prediction):
+        with self._lock:
+            if version != self._version:
+                self.version_changes += self._version is not None
+                self._version = version
+            key = (version, key)
+            expires_at = time.monotonic() + self.ttl_s if self.ttl_s else None
+            self._entries[key] = (prediction, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model_version": self._version,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "version_changes": self.version_changes,
+            }
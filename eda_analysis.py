@@ -6,7 +6,7 @@ import sys
 sys.path.append(os.path.abspath("auto_eda_project"))
 
 from preprocessing.preprocessing import get_preprocessor
-from eda.processed_eda import analyze_skewness, analyze_outliers
+from eda.outlier_stats import analyze_skewness, analyze_outliers, compute_numeric_stats
 
 if __name__ == "__main__":
     data_path = os.path.join("auto_eda_project", "Data", "Software_Salaries.csv")
@@ -18,6 +18,8 @@ if __name__ == "__main__":
     feature_names = preprocessor.get_feature_names_out()
     processed_df = pd.DataFrame(processed_data, columns=feature_names)
 
-    # Run EDA
-    analyze_skewness(processed_df)
-    analyze_outliers(processed_df)
+    # Run EDA (one stats pass; only flagged features are plotted)
+    stats = compute_numeric_stats(processed_df)
+    print(stats.to_string())
+    analyze_skewness(processed_df, save_dir="eda_output/processed_eda/skewness", stats=stats)
+    analyze_outliers(processed_df, save_dir="eda_output/processed_eda/outliers", stats=stats)
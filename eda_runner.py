@@ -12,6 +12,10 @@ from preprocessing.preprocessing import get_preprocessor
 from eda.processed_visuals import plot_processed_univariate, plot_processed_boxplots
 # 📍 Data path
 DATA_PATH = os.path.join("auto_eda_project", "Data", "Software_Salaries.csv")
+# ⚡ Worker processes for figure rendering (-1 = all cores, 1 = sequential)
+EDA_N_JOBS = -1
+# 🔎 True = full ydata-profiling report (slow on large tables), False = fast sampled profile
+AUTOEDA_FULL = False
 
 def main():
     if not os.path.exists(DATA_PATH):
@@ -20,17 +24,17 @@ def main():
     df = pd.read_csv(DATA_PATH)
 
     # 🔎 Step 1: Run AutoEDA report
-    run_autoeda(df, output_path="eda_output", report_name="autoeda_report.html")
+    run_autoeda(df, output_path="eda_output", report_name="autoeda_report.html", full=AUTOEDA_FULL)
 
     # 📊 Step 2: Standard EDA visuals
-    plot_univariate(df)
-    plot_boxplots(df)
-    plot_bivariate(df, target='adjusted_total_usd')
+    plot_univariate(df, n_jobs=EDA_N_JOBS)
+    plot_boxplots(df, n_jobs=EDA_N_JOBS)
+    plot_bivariate(df, target='adjusted_total_usd', n_jobs=EDA_N_JOBS)
 
     # 🧼 Step 3: After preprocessing — visualize transformed distributions
     preprocessor = get_preprocessor(df)
-    plot_processed_univariate(df)
-    plot_processed_boxplots(df)
+    plot_processed_univariate(df, n_jobs=EDA_N_JOBS)
+    plot_processed_boxplots(df, n_jobs=EDA_N_JOBS)
 
     print("✅ EDA completed successfully!")
 
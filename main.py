@@ -9,6 +9,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "auto_eda_project"))
 # Modular imports
 from data_ingestion.data_loader import load_data
 from preprocessing.cat_typo_cleaner import clean_categorical_typos
+from preprocessing import category_normalizer
+from preprocessing.category_normalizer import CategoryNormalizer
+from cache.dataset_cache import DatasetCache, code_fingerprint, fingerprint_file, fingerprint_table
+from db.db_connect import get_engine
 from model.train_model import train_models
 from model.evaluate_model import evaluate_model
 
@@ -18,32 +22,26 @@ USE_DB = False  # 🔁 Toggle this: True = load from DB, False = load from CSV
 DATA_PATH = os.path.join("auto_eda_project", "Data", "Software_Salaries.csv")
 TABLE_NAME = "software_salaries"
 TARGET = "adjusted_total_usd"
+LOAD_CHUNKSIZE = 100_000  # Rows per chunk; strings -> category, lossless numeric downcasts
+DATASET_CACHE_DIR = os.path.join("auto_eda_project", "cache")
+DATASET_CACHE_MAX_BYTES = 2 * 1024 ** 3
 MODEL_SAVE_PATH = os.path.join("auto_eda_project", "save_model", "best_capstone_model.pkl")
+CATEGORY_MAPPINGS_PATH = os.path.join("auto_eda_project", "save_model", "category_mappings.json")
 # -------------------------------
 
-def main():
-    print("🚀 Starting End-to-End ML Pipeline...")
-
-    # 1️⃣ Load Dataset (from DB or CSV)
-    try:
-        if USE_DB:
-            print(f"🔌 Loading data from PostgreSQL table: {TABLE_NAME}")
-            df = load_data(from_db=True, table_name=TABLE_NAME)
-        else:
-            print(f"📄 Loading data from file: {DATA_PATH}")
-            df = load_data(file_path=DATA_PATH)
-    except Exception as e:
-        print(f"❌ Failed to load data: {e}")
-        return
-        # 🧼 Ensure target column is clean and numeric
+def clean_dataset(df):
+    """
+    Cleans the raw salary data: numeric target and fixed job-title typos.
+    """
+    # 🧼 Ensure target column is clean and numeric
     print(f"\n🔍 Target column '{TARGET}' type: {df[TARGET].dtype}")
     print(df[TARGET].describe())
 
     # Clean currency symbols, commas, or non-numeric issues if any
-    if df[TARGET].dtype == 'object':
+    if not pd.api.types.is_numeric_dtype(df[TARGET]):
         print("🧽 Cleaning target column with string values...")
         df[TARGET] = (
-            df[TARGET]
+            df[TARGET].astype(str)
             .replace('[\$,₹,€,£]', '', regex=True)
             .replace(',', '', regex=True)
             .astype(float)
@@ -52,8 +50,51 @@ def main():
     # Confirm cleaned target stats before transformation
     print(f"\n✅ Cleaned target stats (pre-log):\n{df[TARGET].describe()}")
 
-    # 2️⃣ Clean typos in categorical columns
-    df = clean_categorical_typos(df)
+    # Clean typos in categorical columns (mappings are saved for the serving app)
+    normalizer = CategoryNormalizer().fit(df)
+    normalizer.save(CATEGORY_MAPPINGS_PATH)
+    return clean_categorical_typos(df, normalizer=normalizer)
+
+
+def load_clean_dataset():
+    """
+    Returns the cleaned dataset, from the cache when neither the source data nor
+    the cleaning code changed since the last run.
+    """
+    cache = DatasetCache(DATASET_CACHE_DIR, max_bytes=DATASET_CACHE_MAX_BYTES)
+    if USE_DB:
+        source_fingerprint = fingerprint_table(get_engine(), TABLE_NAME)
+    else:
+        source_fingerprint = fingerprint_file(DATA_PATH, index_path=cache.index_path)
+    key = cache.make_key(source_fingerprint, code_fingerprint(clean_dataset, clean_categorical_typos,
+                                                                  category_normalizer))
+
+    df = cache.get(TABLE_NAME, key)
+    if df is not None:
+        return df
+
+    if USE_DB:
+        print(f"🔌 Loading data from PostgreSQL table: {TABLE_NAME}")
+        df = load_data(from_db=True, table_name=TABLE_NAME,
+                       chunksize=LOAD_CHUNKSIZE, optimize_dtypes=True)
+    else:
+        print(f"📄 Loading data from file: {DATA_PATH}")
+        df = load_data(file_path=DATA_PATH, chunksize=LOAD_CHUNKSIZE, optimize_dtypes=True)
+
+    df = clean_dataset(df)
+    cache.put(TABLE_NAME, key, df)
+    return df
+
+
+def main():
+    print("🚀 Starting End-to-End ML Pipeline...")
+
+    # 1️⃣ Load + clean dataset (from DB or CSV, cached across runs)
+    try:
+        df = load_clean_dataset()
+    except Exception as e:
+        print(f"❌ Failed to load data: {e}")
+        return
 
     # 3️⃣ Train & Track with MLflow + Save .pkl
     print("\n🤖 Training models and logging to MLflow...")